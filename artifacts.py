@@ -0,0 +1,173 @@
+import json
+import os
+import shutil
+from collections import namedtuple
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from perf import span
+
+# Ön hesaplanmış sayfa çıktılarının (precompute.py) dizini
+ARTIFACT_DIR = os.environ.get(
+    "TCMB_ARTIFACT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts"),
+)
+
+# Dizin düzeni değiştiğinde artırılır; farklı sürümdeki çıktılar okunmaz
+SCHEMA = 1
+
+# Bu süreden eski çıktılar kullanılmaz, sayfa veriyi canlı hesaplar (saat). Sayfanın
+# serilerinin son yayınından (bkz. prefetch.PAGE_JOBS) önce hazırlanan çıktılar da kullanılmaz.
+MAX_AGE = timedelta(hours=float(os.environ.get("TCMB_ARTIFACT_MAX_AGE", 24)))
+
+# Tutulan eski sürüm sayısı
+KEEP_VERSIONS = 3
+
+# Bir sayfanın tabloları (ad -> DataFrame), grafikleri (ad -> Plotly figürü) ve çekilemeyen parçaları
+PageResult = namedtuple("PageResult", ["tables", "figures", "failures"])
+
+
+def _range_dir(days):
+    return f"{days}g"
+
+
+def _write_atomic(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class ArtifactWriter:
+    """Sayfa çıktılarını yeni bir sürüm dizinine yazar.
+
+    Tablolar Parquet, grafikler Plotly JSON olarak saklanır. commit() çağrılana
+    kadar sürüm görünmez; LATEST dosyası en son tamamlanan sürümü gösterir.
+    """
+
+    def __init__(self, root, as_of):
+        self.root = root
+        self.version = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._tmp = os.path.join(root, f".{self.version}.tmp")
+        os.makedirs(self._tmp, exist_ok=True)
+        self.manifest = {
+            "schema": SCHEMA,
+            "version": self.version,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "as_of": as_of.isoformat(timespec="seconds"),
+            "pages": {},
+        }
+
+    def add(self, page, days, result):
+        directory = os.path.join(self._tmp, page, _range_dir(days))
+        os.makedirs(os.path.join(directory, "tables"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "figures"), exist_ok=True)
+        for name, table in result.tables.items():
+            table.to_parquet(os.path.join(directory, "tables", f"{name}.parquet"))
+        for name, figure in result.figures.items():
+            with open(os.path.join(directory, "figures", f"{name}.json"), "w", encoding="utf-8") as f:
+                f.write(figure.to_json())
+        self.manifest["pages"].setdefault(page, {})[str(days)] = {
+            "tables": sorted(result.tables),
+            "figures": sorted(result.figures),
+        }
+
+    def commit(self, keep=KEEP_VERSIONS):
+        with open(os.path.join(self._tmp, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=1)
+        os.replace(self._tmp, os.path.join(self.root, self.version))
+        _write_atomic(os.path.join(self.root, "LATEST"), self.version)
+
+        # Okuyan süreçler yeni sürüme geçene kadar birkaç eski sürüm korunur
+        versions = sorted(name for name in os.listdir(self.root) if name[:1].isdigit())
+        for name in versions[:-keep]:
+            shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+        return self.version
+
+    def discard(self):
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+
+@lru_cache(maxsize=8)
+def _manifest(directory):
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Sürüm dizinleri değişmediği için okunan dosyalar süreç boyunca paylaşılır
+@lru_cache(maxsize=512)
+def _read_table(path):
+    import pandas as pd
+    return pd.read_parquet(path)
+
+
+@lru_cache(maxsize=512)
+def _read_figure(path):
+    # st.plotly_chart sözlük kabul eder; Figure nesnesi kurmanın doğrulama maliyeti atlanır
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class _Files(Mapping):
+    # Ad -> dosya eşlemesi; dosyalar yalnızca istendiğinde okunur
+    def __init__(self, directory, names, extension, reader):
+        self._directory = directory
+        self._names = names
+        self._extension = extension
+        self._reader = reader
+
+    def __getitem__(self, name):
+        if name not in self._names:
+            raise KeyError(name)
+        return self._reader(os.path.join(self._directory, f"{name}{self._extension}"))
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+
+def load(page, days, root=ARTIFACT_DIR, max_age=MAX_AGE, now=None):
+    # Sayfanın ilgili zaman aralığı için en son ön hesaplanmış çıktısı.
+    # (PageResult, hesaplama anı) döndürür; çıktı yoksa veya eskiyse None.
+    with span("fetch", "artifact", days=days) as timing:
+        artifact = _load(page, days, root, max_age, now)
+        timing.tags["cache"] = "miss" if artifact is None else "hit"
+    return artifact
+
+
+def _released_since(page, as_of, now):
+    # Çıktı hazırlandıktan sonra sayfanın serileri yeniden yayımlandıysa (yayın saatleri
+    # İstanbul saatiyle; as_of ve now sunucunun yerel saatidir)
+    from prefetch import ISTANBUL, PAGE_JOBS, last_release
+    job = PAGE_JOBS.get(page)
+    if job is None:
+        return False
+    return as_of.astimezone() < last_release(job, now.astimezone(ISTANBUL))
+
+
+def _load(page, days, root, max_age, now):
+    try:
+        with open(os.path.join(root, "LATEST"), encoding="utf-8") as f:
+            version = f.read().strip()
+        directory = os.path.join(root, version)
+        manifest = _manifest(directory)
+    except (OSError, ValueError):
+        return None
+    entry = manifest["pages"].get(page, {}).get(str(days))
+    as_of = datetime.fromisoformat(manifest["as_of"])
+    now = now or datetime.now()
+    if manifest.get("schema") != SCHEMA or entry is None or now - as_of > max_age:
+        return None
+    if _released_since(page, as_of, now):
+        return None
+
+    directory = os.path.join(directory, page, _range_dir(days))
+    result = PageResult(
+        tables=_Files(os.path.join(directory, "tables"), entry["tables"], ".parquet", _read_table),
+        figures=_Files(os.path.join(directory, "figures"), entry["figures"], ".json", _read_figure),
+        failures=[],
+    )
+    return result, as_of
@@ -0,0 +1,105 @@
+import threading
+import time
+from datetime import timedelta
+
+import pandas as pd
+
+from data_service import load_frame
+from series_store import default_store
+
+# İlk çizimde yüklenen en yeni dilim ve arka planda her adımda eklenen geçmiş (gün)
+CHUNK_DAYS = 365
+
+# Sayfaların arka plan yüklemesini yoklama aralığı (saniye)
+POLL_SECONDS = 1
+
+# Biten işler bu süre boyunca oturumlar arasında paylaşılır (saniye)
+FINISHED_TTL = 60
+
+
+class Backfill:
+    """İstenen aralığın eski geçmişini yıl yıl, yeniden eskiye arka planda yükler.
+
+    loaded_from o ana kadar önbelleğe yüklenmiş aralığın başıdır; sayfa
+    [loaded_from, end] aralığını çizer ve iş bitene kadar yoklar.
+    """
+
+    def __init__(self, client, codes, start, end, freq, loaded_from):
+        self.client = client
+        self.codes = list(codes)
+        self.start = start
+        self.end = end
+        self.freq = freq
+        self.loaded_from = loaded_from
+        self.error = None
+        self.finished_at = None
+        self._thread = threading.Thread(target=self._run, name="tcmb-backfill", daemon=True)
+
+    @property
+    def done(self):
+        return self.finished_at is not None
+
+    def start_thread(self):
+        self._thread.start()
+
+    def _run(self):
+        store = default_store()
+        try:
+            while self.loaded_from > self.start:
+                # Her adımda yalnızca eksik baş aralığı (bir yıl) çekilir; kuyruk ilk yüklemede
+                # sorulduğu için yeniden sorulmaz. İstatistikler ve özetler iş bitince bir kez kurulur
+                chunk_start = max(self.start, self.loaded_from - timedelta(days=CHUNK_DAYS))
+                failures = store.prepend(self.client, self.codes, chunk_start, self.end, self.freq)
+                if failures:
+                    self.error = failures[0].error
+                    break
+                self.loaded_from = chunk_start
+        except Exception as e:
+            self.error = e
+        finally:
+            try:
+                store.rebuild(self.codes, self.freq)
+            except Exception as e:
+                self.error = self.error or e
+            self.finished_at = time.monotonic()
+
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def start(client, codes, start, end, freq="D"):
+    # Aralığın yerel depoda bulunan kısmını, yoksa en yeni CHUNK_DAYS günlük dilimini hemen
+    # yükler; daha eski geçmişi arka planda tamamlayan işi (Backfill) döndürür. İlk çizimin
+    # süresi böylece istenen aralığın uzunluğundan bağımsızdır. Aynı aralık için oturumlar
+    # aynı işi paylaşır.
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+    codes = list(dict.fromkeys(codes))
+    key = (frozenset(codes), freq, start.normalize(), end.normalize())
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is not None and (not job.done or time.monotonic() - job.finished_at < FINISHED_TTL):
+            return job
+
+    first = end - timedelta(days=CHUNK_DAYS)
+    local_from = default_store().covered_from(codes)
+    if local_from is not None:
+        first = min(first, local_from)
+    first = max(start, first)
+    load_frame(client, codes, first, end, freq)
+
+    job = Backfill(client, codes, start, end, freq, first)
+    if first <= start:
+        # Aralığın tamamı zaten yüklendi
+        job.finished_at = time.monotonic()
+    with _jobs_lock:
+        running = _jobs.get(key)
+        if running is not None and not running.done:
+            return running
+        for stale in [k for k, j in _jobs.items() if j.done and time.monotonic() - j.finished_at >= FINISHED_TTL]:
+            del _jobs[stale]
+        _jobs[key] = job
+    if not job.done:
+        job.start_thread()
+    return job
@@ -0,0 +1,145 @@
+"""Ölçümler için EVDS yerine geçen yerel HTTP sunucusu.
+
+EvdsClient'ın (evds_client.py) gönderdiği istekleri EVDS gibi cevaplar: URL'deki
+series, startDate ve endDate parametrelerine göre JSON "items" listesi döner.
+Veri sentetik olarak üretilir (synthetic.py; her seri kodu için, 1995'ten bu
+yana günlük veya aylık) ya da precompute.py record ile kaydedilmiş fikstürlerden
+okunur. Her isteğe sabit gecikme eklenebilir; istek sayısı ve gönderilen bayt
+sayılır. Uygulama EVDS_BASE_URL ile sunucuya yönlendirilir:
+
+    python benchmarks/fake_evds.py --port 8765 --latency 0.1
+    EVDS_BASE_URL=http://127.0.0.1:8765/ API_KEY=benchmark streamlit run streamlit_app.py
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+class FixtureItems:
+    """Kaydedilmiş fikstürlerden (precompute.FixtureEvds) EVDS "items" listesi."""
+
+    def __init__(self, directory):
+        from precompute import FixtureEvds
+        self.client = FixtureEvds(directory)
+
+    def items(self, series, startdate, enddate=""):
+        frame = self.client.get_data(series, startdate, enddate)
+        records = frame.to_dict("records")
+        for record in records:
+            for column, value in record.items():
+                if column != "Tarih":
+                    record[column] = None if value is None or math.isnan(value) else f"{value:.4f}"
+        return records
+
+
+class FakeEvds:
+    """EVDS'nin get_data uç noktasını taklit eden, arka planda çalışan sunucu.
+
+    source items(series, startdate, enddate) arayüzünü sunar (SyntheticEvds
+    veya FixtureItems). Bilinmeyen seriler için EVDS gibi hata döndürülür.
+    """
+
+    def __init__(self, source, latency=0.0, host="127.0.0.1", port=0):
+        self.source = source
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._bytes = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-evds", daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self):
+        # Son sıfırlamadan beri cevaplanan istek ve gönderilen bayt sayısı; sayaçlar sıfırlanır
+        with self._lock:
+            counters = {"requests": self._requests, "payload_bytes": self._bytes}
+            self._requests = 0
+            self._bytes = 0
+        return counters
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                # EvdsClient parametreleri kodlamadan yola ekler: /series=A-B&startDate=...&endDate=...
+                params = dict(part.split("=", 1) for part in self.path.lstrip("/").split("&") if "=" in part)
+                if server.latency:
+                    time.sleep(server.latency)
+                try:
+                    series = unquote(params["series"]).split("-")
+                    items = server.source.items(series, params["startDate"], params.get("endDate", ""))
+                except (KeyError, ValueError) as e:
+                    self.send_error(404, str(e))
+                    return
+                body = json.dumps({"totalCount": len(items), "items": items}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server._requests += 1
+                    server._bytes += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="istek başına gecikme (saniye)")
+    parser.add_argument("--fixtures", help="sentetik veri yerine kullanılacak fikstür dizini")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        source = FixtureItems(args.fixtures)
+    else:
+        from synthetic import SyntheticEvds
+        source = SyntheticEvds()
+    server = FakeEvds(source, latency=args.latency, host=args.host, port=args.port).start()
+    print(f"EVDS_BASE_URL={server.url}")
+    try:
+        while True:
+            time.sleep(60)
+            counters = server.reset()
+            print(f"{counters['requests']} istek, {counters['payload_bytes'] / 1024:.1f} KiB")
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
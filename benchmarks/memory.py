@@ -0,0 +1,105 @@
+"""Eşzamanlı oturum sayısına göre bellek kullanımı ölçümü (Kur Analizi sayfası).
+
+N oturum benzetilir: her oturum rastgele bir zaman aralığı seçer ve sayfanın
+kullandığı veriyi (kur tablosu, fiyatlar ve analizler) oturum durumunda
+tutuyormuş gibi saklar. tracemalloc ile ölçülen bellek artışından oturum
+başına maliyet hesaplanır.
+
+  shared: veri katmanının paylaşılan, salt okunur tablosu ve dilimleri
+  legacy: eski sayfadaki gibi oturum başına float64 kopya ve yardımcı sütunlar
+
+    python benchmarks/memory.py --sessions 1 10 50 100
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RANGE_DAYS = (30, 90, 180, 365, 5 * 365, 10 * 365)
+CURRENCIES = ["USD", "CNY"]
+
+
+def shared_session(client, start, end):
+    import data_service
+    df, _ = data_service.load_frame(client, [data_service.fx_code(c) for c in CURRENCIES], start, end)
+    prices, analytics, _ = data_service.load_fx(client, CURRENCIES, start, end)
+    return df, prices, analytics
+
+
+def legacy_session(client, start, end):
+    # Eski currency.py: oturum başına DataFrame kopyası ve yerinde eklenen yardımcı sütunlar
+    import data_service
+    import numpy as np
+    import pandas as pd
+    frame, _ = data_service.load_frame(client, [data_service.fx_code(c) for c in CURRENCIES], start, end)
+    df = pd.DataFrame(frame.reset_index().to_dict("list"))
+    for currency in CURRENCIES:
+        column = data_service.fx_code(currency).replace(".", "_")
+        df[column] = df[column].astype("float64").interpolate()
+        df[f"{currency}_Getiri"] = df[column].pct_change()
+        returns = df[f"{currency}_Getiri"]
+        df[f"{currency}_Getiri_ZScore"] = (returns - returns.mean()) / returns.std(ddof=0)
+    df["Year"] = df["Tarih"].dt.year
+    df["Ay"] = df["Tarih"].dt.month
+    volatility = df.groupby("Year")[[f"{c}_Getiri" for c in CURRENCIES]].std() * np.sqrt(252)
+    return df, volatility
+
+
+def measure(mode, session_counts, seed=0):
+    from synthetic import SyntheticEvds
+    client = SyntheticEvds()
+    session = shared_session if mode == "shared" else legacy_session
+    now = datetime.now()
+    ranges = [(now - timedelta(days=days), now) for days in RANGE_DAYS]
+
+    # Paylaşılan veri bir kez ısıtılır; ölçülen yalnızca oturum başına artıştır
+    for start, end in ranges[::-1]:
+        shared_session(client, start, end)
+
+    rng = random.Random(seed)
+    results = {}
+    for count in session_counts:
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        sessions = [session(client, *rng.choice(ranges)) for _ in range(count)]
+        results[count] = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        del sessions
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--mode", choices=["shared", "legacy", "both"], default="both")
+    parser.add_argument("--json", help="sonuçların yazılacağı dosya")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.environ.setdefault("TCMB_STORE_DIR", tempfile.mkdtemp(prefix="tcmb-memory-"))
+
+    modes = ["shared", "legacy"] if args.mode == "both" else [args.mode]
+    report = {}
+    for mode in modes:
+        results = measure(mode, args.sessions)
+        counts = sorted(results)
+        per_session = (results[counts[-1]] - results[counts[0]]) / max(counts[-1] - counts[0], 1)
+        report[mode] = {"bytes_by_sessions": results, "bytes_per_session": per_session}
+        for count in counts:
+            print(f"{mode:<7} {count:>5} oturum  {results[count] / 1024:>10.1f} KiB")
+        print(f"{mode:<7} oturum başına ~{per_session / 1024:.1f} KiB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Soğuk başlangıç ve ilk sayfanın etkileşime hazır olma süresi ölçümü.
+
+Her tekrar yeni bir Python sürecinde çalışır: süreç açılışı, Streamlit'in
+yüklenmesi ve streamlit_app.py'nin varsayılan sayfayı (kenar çubuğu ve
+"Verileri Getir" düğmesiyle) ilk kez çizmesi ayrı ayrı ölçülür.
+EVDS'ye bağlanılmaz; arka plan ön yüklemesi kapatılır.
+
+    python benchmarks/startup.py --runs 5 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file(os.path.join(sys.argv[1], "streamlit_app.py"), default_timeout=120)
+at.run()
+t2 = time.perf_counter()
+if at.exception:
+    raise SystemExit(at.exception[0].value)
+heavy = [m for m in ("pandas", "plotly.express", "scipy", "matplotlib", "evds", "pyarrow") if m in sys.modules]
+print(json.dumps({"streamlit_import": t1 - t0, "first_page": t2 - t1, "modules": len(sys.modules), "heavy_modules": heavy}))
+"""
+
+
+def run_once(store_dir):
+    env = dict(os.environ, TCMB_PREFETCH="0", API_KEY="benchmark", TCMB_STORE_DIR=store_dir)
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, ROOT],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    total = time.perf_counter() - start
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_total"] = total
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="sonuçların yazılacağı dosya")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        runs = [run_once(store_dir) for _ in range(args.runs)]
+
+    summary = {
+        metric: {
+            "median": statistics.median(run[metric] for run in runs),
+            "min": min(run[metric] for run in runs),
+        }
+        for metric in ("process_total", "streamlit_import", "first_page")
+    }
+    summary["modules"] = runs[-1]["modules"]
+    summary["heavy_modules"] = runs[-1]["heavy_modules"]
+
+    for metric in ("process_total", "streamlit_import", "first_page"):
+        print(f"{metric:<18} medyan {summary[metric]['median']:.3f} s   en iyi {summary[metric]['min']:.3f} s")
+    print(f"{'modules':<18} {summary['modules']}  ağır: {', '.join(summary['heavy_modules']) or '-'}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"runs": runs, "summary": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""Sayfaların uçtan uca performans ölçümü (sahte EVDS sunucusu ile).
+
+EVDS yerine yerel bir sunucu (fake_evds.py) başlatılır; her senaryo boş bir
+yerel depo ve önbellekle yeni bir Python sürecinde çalışır:
+
+  page: sayfa Streamlit AppTest ile başsız çalıştırılır ("Verileri Getir",
+        seçilen zaman aralığı, arka plan yüklemesi bitene kadar yoklama)
+  data: sayfaların veri katmanı doğrudan çalıştırılır; günlük N serinin
+        (2-50) D günlük (30 gün - 20 yıl) verisi yüklenir, analiz edilir ve
+        grafikleri oluşturulup JSON'a çevrilir
+
+Aşama süreleri (fetch, parse, transform, analytics, render) perf.py
+ölçümlerinden, gönderilen bayt sunucudan, tepe bellek (RSS) süreçten alınır.
+Sayfaların tarayıcıya gönderdiği grafik boyutu (chart_bytes) AppTest'teki
+plotly_chart öğelerinin JSON tanımlarının toplamıdır.
+Aşama sürelerine arka plan yüklemesi de dahildir; toplamları duvar saati
+süresini aşabilir.
+Sonuçlar JSON olarak kaydedilir; --compare ile önceki bir sonuçla
+karşılaştırılır ve eşiği aşan gerileme varsa çıkış kodu 1 olur.
+
+    python benchmarks/suite.py --json baseline.json
+    python benchmarks/suite.py --compare baseline.json --tolerance 0.25
+    python benchmarks/suite.py --pages currency.py --ranges "Son 10 Yıl" --currencies 2 8 --latency 0.1
+    python benchmarks/suite.py --pages --data-days 30 7300 --data-series 2 50
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ("currency.py", "fiyat_endeksleri.py", "tuketici_egilim_anketi.py", "sektorel_enflasyon_verileri.py")
+PHASES = ("fetch", "parse", "transform", "analytics", "render")
+
+# Karşılaştırmada izlenen ölçümler ve gürültü sayılan en küçük mutlak fark
+GATED = {
+    "wall_s": 0.05,
+    **{f"{phase}_s": 0.05 for phase in PHASES},
+    "payload_bytes": 1024,
+    "chart_bytes": 4096,
+    "figure_bytes": 4096,
+    "peak_rss_mib": 10,
+}
+
+# Sayfaların veri alınamadığında gösterdiği uyarıların metinleri (currency.py, series_view.py)
+FAILURE_WARNINGS = ("serileri alınamadı", "öncesi veriler alınamadı")
+
+# Arka plan yüklemesinin bitmesi için en fazla beklenen süre (saniye)
+BACKFILL_TIMEOUT = 600
+
+
+def _peak_rss_mib():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KiB, macOS'ta bayt
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(fn):
+    # fn'in duvar saati süresi, aşama süreleri (perf.totals farkı) ve tepe bellek
+    import perf
+    before = perf.totals()
+    rss_before = _peak_rss_mib()
+    start = time.perf_counter()
+    extra = fn() or {}
+    wall = time.perf_counter() - start
+    after = perf.totals()
+    phases = dict.fromkeys(PHASES, 0.0)
+    for (page, phase), seconds in after.items():
+        phases[phase] = phases.get(phase, 0.0) + seconds - before.get((page, phase), 0.0)
+    return {
+        "wall_s": wall,
+        **{f"{phase}_s": seconds for phase, seconds in phases.items()},
+        "peak_rss_mib": _peak_rss_mib(),
+        "peak_rss_delta_mib": _peak_rss_mib() - rss_before,
+        **extra,
+    }
+
+
+def page_scenario(page, days, currencies):
+    # Sayfanın kullanıcı gibi çalıştırılması: düğme, aralık, yükleme bitene kadar yoklama
+    from streamlit.testing.v1 import AppTest
+
+    from backfill import POLL_SECONDS
+    from catalog import CURRENCIES, TIME_RANGE_DAYS
+    # Ağır modüllerin (pandas, plotly, veri katmanı) yüklenmesi ölçüme katılmaz
+    import pipeline  # noqa: F401
+
+    label = next(label for label, value in TIME_RANGE_DAYS.items() if value == days)
+    stem = os.path.splitext(page)[0]
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=BACKFILL_TIMEOUT)
+    at.run()
+    if stem == "currency":
+        at.sidebar.multiselect[0].set_value(list(CURRENCIES)[:currencies])
+    at.session_state[f"{stem}_range"] = label
+
+    def run():
+        start = time.perf_counter()
+        at.sidebar.button[0].click().run()
+        first_paint = time.perf_counter() - start
+        deadline = time.monotonic() + BACKFILL_TIMEOUT
+        polls = 0
+        while any(info.value.startswith("Geçmiş veriler yükleniyor") for info in at.info):
+            if time.monotonic() > deadline:
+                raise SystemExit(f"{page}: arka plan yüklemesi {BACKFILL_TIMEOUT} saniyede bitmedi")
+            time.sleep(POLL_SECONDS)
+            at.run()
+            polls += 1
+        # Sayfalar şok günlerinde de uyarı gösterir; yalnızca veri alınamadığını bildiren uyarılar hatadır
+        failures = [w.value for w in at.warning if any(marker in w.value for marker in FAILURE_WARNINGS)]
+        problems = [e.value for e in at.exception] + [e.value for e in at.error] + failures
+        if problems:
+            raise SystemExit(f"{page}: {problems[0]}")
+        charts = at.get("plotly_chart")
+        return {
+            "first_paint_s": first_paint,
+            "polls": polls,
+            "charts": len(charts),
+            "chart_bytes": sum(len(chart.proto.spec.encode()) for chart in charts),
+        }
+
+    return _measure(run)
+
+
+def data_scenario(days, series):
+    # Sayfaların veri katmanı: yükleme, kur analizleri ve grafikler (Streamlit'e gönderilen JSON)
+    from datetime import timedelta
+
+    import perf
+    from catalog import CURRENCIES
+    from charts import series_figure
+    from data_service import fx_analytics, fx_code, load_frame
+    from evds_client import get_client
+
+    # Kayıtlı kurlar, gerekirse sentetik kodlar (TP.DK.Xnn.S.YTL) ile tamamlanır
+    names = (list(CURRENCIES) + [f"X{i:02d}" for i in range(series)])[:series]
+    end = datetime.now()
+    start = end - timedelta(days=days)
+
+    def run():
+        with perf.trace("benchmark", days=days, series=series):
+            frame, failures = load_frame(get_client(), [fx_code(name) for name in names], start, end)
+            if failures:
+                raise SystemExit(f"{len(failures)} parça çekilemedi: {failures[0].error}")
+            prices, _ = fx_analytics(frame, names)
+            with perf.span("render", "figures", series=series, rows=len(prices)):
+                size = sum(len(series_figure(prices, name, name, "line").to_json()) for name in names)
+        return {"rows": len(prices), "figure_bytes": size}
+
+    return _measure(run)
+
+
+def run_child(scenario):
+    os.environ.setdefault("API_KEY", "benchmark")
+    if scenario["kind"] == "page":
+        return page_scenario(scenario["page"], scenario["days"], scenario["currencies"])
+    return data_scenario(scenario["days"], scenario["series"])
+
+
+def scenario_name(scenario):
+    if scenario["kind"] == "page":
+        name = f"page:{os.path.splitext(scenario['page'])[0]}:{scenario['days']}d"
+        return f"{name}:{scenario['currencies']}s" if scenario["page"] == "currency.py" else name
+    return f"data:{scenario['days']}d:{scenario['series']}s"
+
+
+def run_scenario(scenario, server):
+    # Her senaryo boş depo ve önbellekle ayrı bir süreçte çalışır
+    store_dir = tempfile.mkdtemp(prefix="tcmb-bench-")
+    env = {key: value for key, value in os.environ.items() if key not in ("TCMB_DEBUG", "TCMB_METRICS_FILE", "TCMB_PERF_LOG")}
+    env.update(
+        TCMB_PREFETCH="0",
+        API_KEY="benchmark",
+        EVDS_BASE_URL=server.url,
+        TCMB_STORE_DIR=store_dir,
+        TCMB_ARTIFACT_DIR=os.path.join(store_dir, "artifacts"),
+    )
+    server.reset()
+    try:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--scenario", json.dumps(scenario)],
+            env=env, cwd=ROOT, capture_output=True, text=True,
+        )
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+    counters = server.reset()
+    if completed.returncode != 0:
+        raise RuntimeError(f"{scenario_name(scenario)} başarısız:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result.update(counters)
+    return result
+
+
+def summarize(runs):
+    # Ölçüm başına medyan; tüm tekrarlar ayrıca saklanır
+    return {metric: statistics.median(run[metric] for run in runs) for metric in runs[0]}
+
+
+def compare(current, baseline, tolerance):
+    # (senaryo, ölçüm, önceki, şimdiki) gerilemeleri; eşik oransal ve mutlak farkın ikisi de aşılınca
+    regressions = []
+    for name, result in current["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        for metric, floor in GATED.items():
+            old, new = previous["summary"].get(metric), result["summary"].get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="*", default=list(PAGES), help="ölçülecek sayfalar (boş: hiçbiri)")
+    parser.add_argument("--ranges", nargs="+", default=["Son 1 Ay", "Son 10 Yıl"], help="sayfa zaman aralıkları")
+    parser.add_argument("--currencies", type=int, nargs="+", default=[2], help="Kur Analizi'nde seçilen kur sayısı (en fazla 8)")
+    parser.add_argument("--data-days", type=int, nargs="*", default=[30, 365, 20 * 365])
+    parser.add_argument("--data-series", type=int, nargs="*", default=[2, 50])
+    parser.add_argument("--latency", type=float, default=0.05, help="sahte EVDS'nin istek başına gecikmesi (saniye)")
+    parser.add_argument("--fixtures", help="sentetik veri yerine kullanılacak fikstür dizini (precompute.py record)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", help="sonuçların yazılacağı dosya")
+    parser.add_argument("--compare", help="karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="izin verilen oransal artış")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_child(json.loads(args.scenario))))
+        return
+
+    from catalog import TIME_RANGE_DAYS
+    from fake_evds import FakeEvds, FixtureItems
+    from synthetic import SyntheticEvds
+
+    scenarios = [
+        {"kind": "page", "page": page, "days": TIME_RANGE_DAYS[label], "currencies": count}
+        for page in args.pages
+        for label in args.ranges
+        for count in (args.currencies if page == "currency.py" else args.currencies[:1])
+    ]
+    scenarios += [
+        {"kind": "data", "days": days, "series": series}
+        for days in args.data_days
+        for series in args.data_series
+    ]
+
+    source = FixtureItems(args.fixtures) if args.fixtures else SyntheticEvds()
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency": args.latency,
+            "source": "fixtures" if args.fixtures else "synthetic",
+            "runs": args.runs,
+        },
+        "scenarios": {},
+    }
+    print(f"{'senaryo':<38} {'toplam':>7} {'fetch':>7} {'parse':>7} {'trans.':>7} {'analiz':>7} {'render':>7} {'KiB':>9} {'grafik':>9} {'MiB':>6}")
+    with FakeEvds(source, latency=args.latency) as server:
+        for scenario in scenarios:
+            runs = [run_scenario(scenario, server) for _ in range(args.runs)]
+            summary = summarize(runs)
+            name = scenario_name(scenario)
+            report["scenarios"][name] = {"scenario": scenario, "summary": summary, "runs": runs}
+            print(
+                f"{name:<38} {summary['wall_s']:>7.3f}"
+                + "".join(f" {summary[f'{phase}_s']:>7.3f}" for phase in PHASES)
+                + f" {summary['payload_bytes'] / 1024:>9.1f}"
+                + f" {summary.get('chart_bytes', summary.get('figure_bytes', 0)) / 1024:>9.1f}"
+                + f" {summary['peak_rss_mib']:>6.0f}"
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for name, metric, old, new in regressions:
+            print(f"GERİLEME {name} {metric}: {old:.3f} -> {new:.3f} (+{(new / old - 1) if old else float('inf'):.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"{args.compare} ile karşılaştırıldı: gerileme yok (eşik %{args.tolerance * 100:.0f})")
+
+
+if __name__ == "__main__":
+    main()
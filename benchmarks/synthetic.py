@@ -0,0 +1,71 @@
+"""Ölçümler için EVDS yerine geçen sentetik veri üreticisi.
+
+Her seri kodu için sabit tohumlu bir rastgele yürüyüş üretilir; aynı tarih
+her istekte aynı değeri alır, böylece üst üste binen aralıklar tutarlıdır.
+TP.DK.* serileri günlük (hafta sonları boş), diğerleri aylık döner.
+"""
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Üretilen serilerin başlangıcı; bu tarihten önceki istekler boş döner
+EPOCH = pd.Timestamp("1995-01-01")
+HISTORY_DAYS = 40 * 366
+
+MONTHLY_PREFIXES = ("bie_", "TP.ENFBEK.", "TP.TG2.")
+
+
+def series_frequency(code):
+    return "M" if code.startswith(MONTHLY_PREFIXES) else "D"
+
+
+class SyntheticEvds:
+    """evdsAPI.get_data ile aynı arayüze sahip, ağa çıkmayan sahte istemci."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self._paths = {}
+
+    def _path(self, code):
+        if code not in self._paths:
+            rng = np.random.default_rng(zlib.crc32(code.encode()))
+            level = 1 + zlib.crc32(code.encode()) % 100
+            self._paths[code] = level * np.exp(np.cumsum(rng.normal(0, 0.005, HISTORY_DAYS)))
+        return self._paths[code]
+
+    def items(self, series, startdate, enddate=""):
+        # EVDS JSON cevabındaki "items" listesi (değerler metin, boş günler None)
+        start = pd.to_datetime(startdate, format="%d-%m-%Y")
+        end = pd.to_datetime(enddate or startdate, format="%d-%m-%Y")
+        if series_frequency(series[0]) == "M":
+            dates = pd.date_range(start.replace(day=1), end, freq="MS")
+            labels = [f"{date.year}-{date.month}" for date in dates]
+        else:
+            dates = pd.date_range(start, end, freq="D")
+            labels = dates.strftime("%d-%m-%Y")
+        dates = dates[dates >= EPOCH]
+        labels = labels[len(labels) - len(dates):]
+        offsets = (dates - EPOCH).days.to_numpy()
+
+        items = [{"Tarih": label} for label in labels]
+        for code in series:
+            values = self._path(code)[offsets]
+            column = code.replace(".", "_")
+            for item, date, value in zip(items, dates, values):
+                weekend = series_frequency(code) == "D" and date.dayofweek >= 5
+                item[column] = None if weekend else f"{value:.4f}"
+        return items
+
+    def get_data(self, series, startdate, enddate="", frequency=""):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        df = pd.DataFrame(self.items(series, startdate, enddate))
+        for code in series:
+            column = code.replace(".", "_")
+            if column in df.columns:
+                df[column] = df[column].astype("float")
+        return df
@@ -0,0 +1,123 @@
+from collections import namedtuple
+from datetime import timedelta
+
+# Sayfaların ortak kataloğu: zaman aralıkları, kurlar ve seri kaydı.
+# Sayfalar, veri katmanı (fetch_planner.py), ön yükleme ve çevrimdışı ön hesaplama
+# (precompute.py) aynı tanımları kullanır; yeni bir seri yalnızca buraya eklenir.
+
+# Tarih aralığı seçenekleri (gün)
+TIME_RANGE_DAYS = {
+    "Son 1 Ay": 30,
+    "Son 3 Ay": 90,
+    "Son 6 Ay": 180,
+    "Son 1 Yıl": 365,
+    "Son 5 Yıl": 5 * 365,
+    "Son 10 Yıl": 10 * 365,
+}
+
+
+def time_ranges(today):
+    # Seçenek adı -> başlangıç tarihi
+    return {label: today - timedelta(days=days) for label, days in TIME_RANGE_DAYS.items()}
+
+
+# Seri frekansları ve EVDS'nin "Tarih" sütununda döndürdüğü biçim
+DATE_FORMATS = {
+    "D": "%d-%m-%Y",
+    "M": "%Y-%m",
+}
+
+# Kur kodları ile görünen adları ve grafik renklerini eşleştir
+CURRENCIES = {
+    'USD': ('Dolar', 'blue'),
+    'CNY': ('Çin Yuanı', 'green'),
+    'EUR': ('Euro', 'orange'),
+    'GBP': ('İngiliz Sterlini', 'purple'),
+    'CHF': ('İsviçre Frangı', 'red'),
+    'JPY': ('Japon Yeni', 'gray'),
+    'SAR': ('Suudi Arabistan Riyali', 'olive'),
+    'RUB': ('Rus Rublesi', 'brown'),
+}
+
+# Varsayılan olarak gösterilen kurlar
+DEFAULT_CURRENCIES = ("USD", "CNY")
+
+# Grafik çözünürlüğü seviyelerinin görünen adları
+LEVEL_NAMES = {'D': 'Günlük', 'W': 'Haftalık', 'M': 'Aylık', 'Y': 'Yıllık'}
+
+
+def fx_code(currency):
+    # 'USD' -> 'TP.DK.USD.S.YTL' (satış kuru)
+    return f"TP.DK.{currency}.S.YTL"
+
+
+class Series(namedtuple("Series", ["code", "label", "page", "freq", "date_format", "chart"])):
+    """Kayıtlı bir EVDS serisi: kod, görünen ad, gösterildiği sayfa (modül adı),
+    frekans, EVDS'nin tarih biçimi ve grafik türü ("line" veya "bar")."""
+
+    __slots__ = ()
+
+    @property
+    def column(self):
+        # 'TP.DK.USD.S.YTL' -> 'TP_DK_USD_S_YTL' (evds kütüphanesinin sütun adlandırması)
+        return self.code.replace(".", "_")
+
+
+def _series(page, freq, chart, labels):
+    return [Series(code, label, page, freq, DATE_FORMATS[freq], chart) for code, label in labels.items()]
+
+
+# Seri kaydı; aynı frekanstaki seriler sayfadan bağımsız olarak birlikte çekilir
+SERIES = (
+    *_series("currency", "D", "line", {fx_code(currency): name for currency, (name, _) in CURRENCIES.items()}),
+    *_series("fiyat_endeksleri", "M", "line", {
+        'bie_tukfiy4': 'TÜİK - Fiyat Endeksi (Tüketici) (2003=100)',
+        'bie_feoktg': 'TÜİK - Fiyat Endeksi-Özel Kapsamlı TÜFE Göstergeleri (2003=100) (Yeni Seri)',
+        'bie_tufe1yi': 'TÜİK - Fiyat Endeksi (Yurt İçi Üretici Fiyatları) (2003=100) (NACE REV.2)',
+        'bie_ufeyd': 'TÜİK - Fiyat Endeksi (Yurt Dışı Üretici Fiyatları) (2010=100) (NACE REV.2)',
+        'bie_ito68': 'İTO - Geçinme Endeksi (Ücretliler) (1968=100)',
+        'bie_ito95': 'İTO - Geçinme Endeksi (Ücretliler) (1995=100)',
+        'bie_itouge85': 'İTO - Geçinme Endeksi (Ücretliler)-İstanbul (1985=100)',
+        'bie_itotefe': 'İTO - Fiyat Endeksi (Toptan Eşya) (1968=100)',
+        'bie_itoteuc': 'İTO - Fiyat (Toptan Eşya) ve Geçinme (Ücretliler) Endeksleri-İstanbul',
+        'bie_brentpetrol': 'Avrupa Brent Petrol Spot FOB Fiyatı (Varil Başına Dolar)',
+        'bie_tarimufe': 'TÜİK - Tarım Ürünleri Üretici Fiyat Endeksi (2020=100)',
+    }),
+    *_series("tuketici_egilim_anketi", "M", "bar", {
+        'TP.TG2.Y01': 'Tüketici Güven Endeksi (*)',
+        'TP.TG2.Y02': 'Hanenin maddi durumu (12 ay öncesine göre mevcut dönemde)',
+        'TP.TG2.Y03': 'Hanenin maddi durum beklentisi (gelecek 12 aylık dönemde)',
+        'TP.TG2.Y04': 'Genel ekonomik durum (12 ay öncesine göre mevcut dönemde)',
+        'TP.TG2.Y05': 'Genel ekonomik durum beklentisi (gelecek 12 aylık dönemde)',
+        'TP.TG2.Y06': 'İşsizlerin sayısı beklentisi (gelecek 12 aylık dönemde)',
+        'TP.TG2.Y07': 'Yarı-dayanıklı tüketim mallarına yönelik harcama yapma düşüncesi (geçen 3 aylık döneme göre gelecek 3 aylık dönemde)',
+        'TP.TG2.Y08': 'Mevcut dönemin dayanıklı tüketim malı satın almak için uygunluğu',
+        'TP.TG2.Y09': 'Dayanıklı tüketim mallarına yönelik harcama yapma düşüncesi (geçen 12 aylık döneme göre gelecek 12 aylık dönemde)',
+        'TP.TG2.Y10': 'Mevcut dönemin tasarruf etmek için uygunluğu',
+        'TP.TG2.Y11': 'Hanenin içinde bulunduğu mali durumu',
+        'TP.TG2.Y12': 'Tasarruf etme ihtimali (gelecek 12 aylık dönemde)',
+        'TP.TG2.Y13': 'Tüketimin finansmanı amacıyla borç kullanma ihtimali (gelecek 3 aylık dönemde)',
+        'TP.TG2.Y14': 'Tüketici fiyatlarının değişimine ilişkin düşünce (geçen 12 aylık dönemde)',
+        'TP.TG2.Y15': 'Tüketici fiyatlarının değişimine ilişkin beklenti (geçen 12 aylık döneme göre gelecek 12 aylık dönemde)',
+        'TP.TG2.Y16': 'Ücretlerin değişimine ilişkin beklenti (geçen 12 aylık döneme göre gelecek 12 aylık dönemde)',
+        'TP.TG2.Y17': 'Otomobil satın alma ihtimali (gelecek 12 aylık dönemde)',
+        'TP.TG2.Y18': 'Konut tamiratına para harcama ihtimali (gelecek 12 aylık dönemde)',
+        'TP.TG2.Y19': 'Konut satın alma veya inşa ettirme ihtimali (gelecek 12 aylık dönemde)',
+    }),
+    *_series("sektorel_enflasyon_verileri", "M", "bar", {
+        'TP.ENFBEK.PKA12ENF': 'Piyasa katılımcılarının 12 ay sonrası yıllık enflasyon beklentileri (%)',
+        'TP.ENFBEK.IYA12ENF': 'Reel sektörün 12 ay sonrası yıllık enflasyon beklentileri (%)',
+        'TP.ENFBEK.TEA12ENF': 'Hanehalkının 12 ay sonrası yıllık enflasyon beklentileri (%)',
+        'TP.ENFBEK.TEA12': 'Tüketici fiyatlarının daha hızlı veya aynı oranda artacağını bekleyen hanehalkı oranı (%)',
+        'TP.ENFBEK.TEA345': 'Tüketici fiyatlarının aynı kalacağını, düşeceğini veya daha düşük bir oranla artacağını bekleyen hanehalkı oranı (%)'
+    }),
+)
+
+SERIES_BY_CODE = {series.code: series for series in SERIES}
+
+# Sayfalar (modül adları), kayıt sırasıyla
+PAGES = tuple(dict.fromkeys(series.page for series in SERIES))
+
+
+def page_series(page):
+    return [series for series in SERIES if series.page == page]
@@ -0,0 +1,76 @@
+import streamlit as st
+import plotly.graph_objects as go
+
+import perf
+from catalog import LEVEL_NAMES
+from downsample import line_trace
+
+
+def series_figure(df, column, title, kind="bar"):
+    # Tek bir seri için grafik; kind "bar" veya "line"
+    fig = go.Figure()
+    if kind == "line":
+        fig.add_trace(line_trace(df.index, df[column], mode='lines+markers', name=title))
+    else:
+        fig.add_trace(go.Bar(x=df.index, y=df[column], name=title))
+    fig.update_layout(
+        title=f"{title}",
+        xaxis_title="Tarih",
+        yaxis_title="Değer",
+        template="plotly_dark"
+    )
+    return fig
+
+
+def price_figure(price, name, color, level, rollup=None, key=None):
+    # Satış Kuru Grafiği: uzun aralıklarda önceden hesaplanmış haftalık/aylık özetten
+    # (periyot sonu ve en düşük-en yüksek bandı), kısa aralıklarda günlük veriden
+    fig = go.Figure()
+    if rollup is not None:
+        fig.add_trace(go.Scatter(x=rollup['Tarih'], y=rollup['max'], mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=rollup['Tarih'], y=rollup['min'], mode='lines', line=dict(width=0), fill='tonexty', name=f'{name} En Düşük-En Yüksek'))
+        fig.add_trace(go.Scatter(x=rollup['Tarih'], y=rollup['last'], mode='lines', name=f'{name} Satış Kuru', line=dict(color=color)))
+    else:
+        fig.add_trace(line_trace(price.index, price.values, key=key, mode='lines', name=f'{name} Satış Kuru', line=dict(color=color)))
+    fig.update_layout(title=f"{name} Satış Kuru ({LEVEL_NAMES[level]})", xaxis_title="Tarih", yaxis_title="Türk Lirası (TL)", template="plotly_dark")
+    return fig
+
+
+def seasonality_figure(monthly_avg, name):
+    # Mevsimsellik Grafiği
+    fig = go.Figure(go.Bar(x=monthly_avg.index, y=monthly_avg.values))
+    fig.update_layout(title=f"{name} Mevsimsellik Analizi", xaxis_title="Ay", yaxis_title="Ortalama Kurlar")
+    return fig
+
+
+def shock_figure(zscores, shock_mask, name, key=None):
+    # Şok Analizi: z-skor çizgisi (şok günleri azaltmada korunur) ve şok işaretleri
+    shocks = zscores[shock_mask]
+    fig = go.Figure()
+    fig.add_trace(line_trace(zscores.index, zscores.values, keep=shock_mask.values, key=key, mode='lines', name=f'{name} Z-Skor'))
+    fig.add_trace(go.Scatter(x=shocks.index, y=shocks.values, mode='markers', name='Şoklar', marker=dict(color='red', size=8)))
+    fig.update_layout(title=f"{name} Şok Analizi (Z-Skor)", xaxis_title="Tarih", yaxis_title="Z-Skor", template="plotly_dark")
+    return fig
+
+
+@st.fragment
+def series_picker(df, series, figures=None):
+    # Grafikler yalnızca seçilen seriler için oluşturulup gönderilir;
+    # seçim değiştiğinde tüm sayfa değil yalnızca bu bölüm yeniden çalışır.
+    # series: sayfanın kayıtlı serileri (catalog.Series; başlık ve grafik türü).
+    # figures verilmişse (ön hesaplanmış grafikler) grafikler yeniden oluşturulmaz.
+    by_column = {entry.column: entry for entry in series}
+    columns = [column for column in df.columns if column in by_column]
+    selected = st.multiselect(
+        "Gösterilecek seriler",
+        columns,
+        default=columns[:1],
+        format_func=lambda column: by_column[column].label,
+    )
+    # Seçim değiştiğinde bölüm sayfanın izi dışında çalışır; ölçüm yine sayfa adıyla kaydedilir
+    with perf.trace(series[0].page), perf.span("render", "charts", series=len(selected), rows=len(df)):
+        for column in selected:
+            if figures is not None and column in figures:
+                st.plotly_chart(figures[column])
+            else:
+                st.plotly_chart(series_figure(df, column, by_column[column].label, by_column[column].chart))
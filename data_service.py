@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from catalog import fx_code
+from fetch_planner import plan
+from fx_analytics import analyze
+from perf import span
+from pyramid import CHART_POINTS, choose_level
+from result_cache import ResultCache
+from series_store import default_store
+from single_flight import SingleFlight
+
+# Süreç genelinde tüm oturumların paylaştığı sonuç önbelleği
+shared_cache = ResultCache()
+
+# Aynı (seri, aralık) sorgusu için eşzamanlı yüklemeleri birleştirir
+flights = SingleFlight()
+
+# Kur analizleri için önbellek boyutu
+FX_CACHE_SIZE = 64
+
+_fx_cache = OrderedDict()
+_fx_cache_lock = threading.Lock()
+
+
+def load_frame(client, codes, start, end, freq="D"):
+    # Önce önbelleğe bakılır; yoksa yerel depo eksik aralıkları EVDS'den tamamlar.
+    # (tablo, çekilemeyen parçalar) döndürür; tablo Tarih indeksli ve float32'dir.
+    # Yalnızca istenen seriler çekilir; aynı anda karşılanacak talepler load_many ile birleştirilir.
+    # Ölçümde önbellek sonucu: hit, miss (depodan yüklendi) veya coalesced (eşzamanlı bir
+    # yüklemenin sonucu beklendi)
+    codes = list(dict.fromkeys(codes))
+    key = (frozenset(codes), freq, pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize())
+    loaded = []
+
+    def load():
+        loaded.append(True)
+        return default_store().get_frame(client, codes, start, end, freq)
+
+    with span("fetch", "load_frame", series=len(codes)) as timing:
+        # Birleştirilen çağıranlar aynı salt okunur dilimi paylaşır; yazma copy-on-write ile kopyalar
+        (frame, failures), shared = flights.do(
+            key,
+            lambda: shared_cache.get_or_load(codes, freq, start, end, load),
+        )
+        timing.tags["rows"] = len(frame)
+        timing.tags["cache"] = "miss" if loaded else "coalesced" if shared else "hit"
+    return frame, failures
+
+
+def load_many(client, demands):
+    # Aynı anda karşılanacak (seriler, başlangıç, bitiş, frekans) taleplerini planlayıp her plan
+    # için tek yükleme yapar; talepler bu yüklemenin önbellek kaydından aynı sırayla
+    # (tablo, çekilemeyen parçalar) olarak cevaplanır.
+    for request in plan(demands):
+        load_frame(client, request.codes, request.start, request.end, request.freq)
+    return [load_frame(client, codes, start, end, freq) for codes, start, end, freq in demands]
+
+
+def series_stats(code):
+    # Yerel depodaki tüm geçmiş için artımlı istatistikler (son getiri, kayan volatilite vb.)
+    return default_store().stats(code)
+
+
+def load_rollup(code, start, end, freq="D", min_points=CHART_POINTS):
+    # Aralığı ve grafik çözünürlüğünü karşılayan en kaba özet seviyesi.
+    # (seviye, tablo) döndürür; ham veri gerekiyorsa tablo None'dır.
+    # Seri önce load_frame ile yüklenmiş olmalıdır.
+    level = choose_level(start, end, freq, min_points)
+    frame = default_store().rollup(code, level) if level != freq else None
+    if frame is None:
+        return freq, None
+    start = pd.Timestamp(start).normalize()
+    return level, frame[(frame["Tarih"] >= start) & (frame["Tarih"] <= pd.Timestamp(end))].reset_index(drop=True)
+
+
+def load_fx(client, currencies, start, end):
+    # Seçilen kurların satış fiyatları (tarih indeksli, interpolasyonlu) ve analizleri.
+    # (fiyatlar, analizler, çekilemeyen parçalar) döndürür.
+    df, failures = load_frame(client, [fx_code(currency) for currency in currencies], start, end, freq="D")
+    prices, analytics = fx_analytics(df, currencies)
+    return prices, analytics, failures
+
+
+def fx_analytics(df, currencies):
+    # load_frame tablosundan (veya onun bir dilimden) fiyatlar ve analizler. Sonuçlar oturumlar
+    # arasında paylaşılır ve salt okunurdur; veri değişmedikçe analizler yeniden hesaplanmaz.
+    with span("analytics", "fx_analytics", series=len(currencies), rows=len(df)) as timing:
+        key = (tuple(currencies), int(pd.util.hash_pandas_object(df).sum()))
+        with _fx_cache_lock:
+            cached = _fx_cache.get(key)
+            if cached is not None:
+                _fx_cache.move_to_end(key)
+        timing.tags["cache"] = "miss" if cached is None else "hit"
+        if cached is not None:
+            return cached
+
+        # NaN değerlerini lineer interpolasyon ile doldurma
+        with span("transform", "interpolate", rows=len(df)):
+            prices = df.rename(columns={fx_code(currency).replace(".", "_"): currency for currency in currencies})
+            prices = prices[list(currencies)].interpolate()
+        analytics = analyze(prices)
+
+    with _fx_cache_lock:
+        _fx_cache[key] = (prices, analytics)
+        while len(_fx_cache) > FX_CACHE_SIZE:
+            _fx_cache.popitem(last=False)
+    return prices, analytics
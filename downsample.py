@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Bir çizgi grafiğinde gönderilecek en fazla nokta (geniş bir grafiğin piksel sayısı mertebesinde)
+POINT_BUDGET = 1500
+
+# Bu sayının üzerindeki nokta sayısında SVG yerine WebGL (Scattergl) kullanılır
+WEBGL_THRESHOLD = 1000
+
+# Azaltılmış seriler için önbellek boyutu
+CACHE_SIZE = 256
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def lttb_indices(x, y, budget):
+    # Largest-Triangle-Three-Buckets: her kovada, önceki seçilen nokta ve sonraki
+    # kovanın ortalamasıyla en büyük üçgeni oluşturan nokta seçilir.
+    n = len(x)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # Sonraki kovaların ortalamaları tek seferde hesaplanır
+    x_sums = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    y_sums = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(x_sums[1:] / counts[1:], x[-1])
+    avg_y = np.append(y_sums[1:] / counts[1:], y[-1])
+
+    previous = 0
+    for bucket in range(budget - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        areas = np.abs(
+            (x[previous] - avg_x[bucket]) * (by - y[previous])
+            - (x[previous] - bx) * (avg_y[bucket] - y[previous])
+        )
+        previous = lo + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample(x, y, budget=POINT_BUDGET, keep=None, key=None):
+    # NaN noktalar atılır, en küçük/en büyük değerler ve keep ile verilen noktalar
+    # (ör. şok tarihleri) her zaman korunur. key verilirse sonuç önbelleğe alınır.
+    if key is not None:
+        cache_key = (key, budget)
+        with _cache_lock:
+            if cache_key in _cache:
+                _cache.move_to_end(cache_key)
+                return _cache[cache_key]
+
+    x = np.asarray(x)
+    y = np.asarray(y, dtype="float64")
+    valid = ~np.isnan(y)
+    x_valid, y_valid = x[valid], y[valid]
+
+    if len(y_valid) > budget:
+        x_numeric = x_valid.astype("datetime64[ns]").astype(np.int64) if np.issubdtype(x_valid.dtype, np.datetime64) else x_valid
+        chosen = lttb_indices(x_numeric.astype("float64"), y_valid, budget)
+        forced = [np.argmin(y_valid), np.argmax(y_valid)]
+        if keep is not None:
+            forced.extend(np.flatnonzero(np.asarray(keep)[valid]))
+        chosen = np.union1d(chosen, forced)
+        x_valid, y_valid = x_valid[chosen], y_valid[chosen]
+
+    result = (x_valid, y_valid)
+    if key is not None:
+        with _cache_lock:
+            _cache[cache_key] = result
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return result
+
+
+def line_trace(x, y, budget=POINT_BUDGET, keep=None, key=None, **kwargs):
+    # Azaltılmış çizgi izi; hâlâ yoğunsa WebGL ile çizilir
+    x, y = downsample(x, y, budget=budget, keep=keep, key=key)
+    trace = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    return trace(x=x, y=y, **kwargs)
@@ -0,0 +1,115 @@
+import json
+import os
+import random
+import ssl
+import threading
+import time
+
+import pandas as pd
+import requests
+from evds import BASE_URL, CustomHttpAdapter, EVDSConnectionError
+
+# Bağlantı ve okuma zaman aşımları (saniye)
+CONNECT_TIMEOUT = float(os.environ.get("EVDS_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.environ.get("EVDS_READ_TIMEOUT", 30))
+
+# Geçici hatalarda (5xx, zaman aşımı) yeniden deneme politikası
+MAX_RETRIES = int(os.environ.get("EVDS_MAX_RETRIES", 3))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+# Süreç genelinde TCMB'ye aynı anda açık olabilecek en fazla istek
+MAX_CONCURRENCY = int(os.environ.get("EVDS_MAX_CONCURRENCY", 8))
+
+
+class EvdsClient:
+    """Tüm sayfaların paylaştığı EVDS istemcisi.
+
+    evdsAPI ile aynı get_data arayüzünü sunar; farklı olarak oturumu her
+    istekten sonra kapatmaz, zaman aşımı ve yeniden deneme uygular ve
+    eşzamanlı istek sayısını sınırlar.
+    """
+
+    def __init__(self, key, base_url=BASE_URL, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT, max_retries=MAX_RETRIES,
+                 max_concurrency=MAX_CONCURRENCY, sleep=time.sleep):
+        self.key = key
+        self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self._sleep = sleep
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self.session = self._create_session(max_concurrency)
+
+    def _create_session(self, pool_size):
+        # evds kütüphanesindeki gibi eski TLS yeniden anlaşmasına izin verilir
+        ctx = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+        ctx.options |= 0x4  # OP_LEGACY_SERVER_CONNECT
+        session = requests.Session()
+        session.mount("https://", CustomHttpAdapter(ctx, pool_connections=1, pool_maxsize=pool_size))
+        session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        session.headers["key"] = self.key
+        return session
+
+    def get_data(self, series, startdate, enddate="", frequency=""):
+        if enddate == "":
+            enddate = startdate
+        params = {
+            "series": "-".join(series),
+            "startDate": startdate,
+            "endDate": enddate,
+            "type": "json",
+            "formulas": "",
+            "frequency": str(frequency),
+            "aggregationTypes": "",
+        }
+        # evds kütüphanesi parametreleri kodlamadan URL'ye ekler; aynı biçim korunur
+        query = "&".join(f"{key}={value}" for key, value in params.items())
+        items = json.loads(self._request(self.base_url + query))["items"]
+
+        df = pd.DataFrame(items)
+        for column in [code.replace(".", "_") for code in series]:
+            if column in df.columns:
+                df[column] = df[column].astype("float")
+        if "UNIXTIME" in df.columns:
+            df = df.drop(columns=["UNIXTIME"])
+        return df
+
+    def _request(self, url):
+        attempt = 0
+        while True:
+            try:
+                with self._slots:
+                    response = self.session.get(url, timeout=self.timeout)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                error = e
+            else:
+                if response.status_code == 200:
+                    return response.content
+                if response.status_code < 500:
+                    raise EVDSConnectionError(
+                        f"Connection error, please check your API Key or request. Url:{response.url}")
+                error = EVDSConnectionError(f"EVDS {response.status_code} döndürdü. Url:{response.url}")
+
+            if attempt >= self.max_retries:
+                raise error
+            # Tam jitter'lı üstel bekleme
+            self._sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)))
+            attempt += 1
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    # API anahtarı ortam değişkeninden, yoksa Streamlit secrets'tan okunur
+    global _client
+    with _client_lock:
+        if _client is None:
+            key = os.environ.get("API_KEY")
+            if not key:
+                import streamlit as st
+                key = st.secrets["API_KEY"]
+            _client = EvdsClient(key, base_url=os.environ.get("EVDS_BASE_URL", BASE_URL))
+        return _client
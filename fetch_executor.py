@@ -0,0 +1,97 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pandas as pd
+
+from perf import span
+
+# Aynı anda çalışan parça isteklerinin üst sınırı
+MAX_WORKERS = 4
+
+# Tek istekte gönderilen en fazla seri sayısı
+CHUNK_SIZE = 5
+
+# Frekansa göre tek istekte çekilen en uzun tarih aralığı
+# (aylık seriler ay ortasından bölünmesin diye pratikte tek parça çekilir)
+SPAN_DAYS = {
+    "D": 2 * 365,
+    "M": 50 * 365,
+}
+
+REQUEST_DATE_FORMAT = "%d-%m-%Y"
+
+# Başarısız olan parçanın serileri, aralığı ve hatası
+ChunkFailure = namedtuple("ChunkFailure", ["codes", "start", "end", "error"])
+
+
+def split_codes(codes, chunk_size=CHUNK_SIZE):
+    return [codes[i:i + chunk_size] for i in range(0, len(codes), chunk_size)]
+
+
+def split_range(start, end, span_days):
+    # [start, end] aralığını en fazla span_days günlük, eşit boyutlu ardışık parçalara böler
+    total_days = (end - start).days + 1
+    count = max(-(-total_days // span_days), 1)
+    size = -(-total_days // count)
+    spans = []
+    span_start = start
+    while span_start <= end:
+        span_end = min(span_start + timedelta(days=size - 1), end)
+        spans.append((span_start, span_end))
+        span_start = span_end + timedelta(days=1)
+    return spans
+
+
+def fetch_chunked(client, codes, start, end, freq="D", chunk_size=CHUNK_SIZE,
+                  max_workers=MAX_WORKERS):
+    # Seri listesini ve tarih aralığını parçalara bölüp eşzamanlı çeker.
+    # Sonuç parçaları "Tarih" üzerinde birleştirilir; hatalı parçalar ayrıca döndürülür.
+    # Parçalar sayfa sınırı gözetmez (bkz. fetch_planner.plan); hatalı parçanın serileri
+    # yalnızca o parçanınkilerdir.
+    code_chunks = split_codes(list(dict.fromkeys(codes)), chunk_size)
+    spans = split_range(start, end, SPAN_DAYS.get(freq, SPAN_DAYS["D"]))
+    jobs = [(chunk, window) for chunk in code_chunks for window in spans]
+
+    def run(job):
+        chunk, (span_start, span_end) = job
+        return pd.DataFrame(client.get_data(
+            chunk,
+            startdate=span_start.strftime(REQUEST_DATE_FORMAT),
+            enddate=span_end.strftime(REQUEST_DATE_FORMAT),
+        ))
+
+    with span("fetch", "evds", series=len(codes), requests=len(jobs)):
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)) or 1) as pool:
+            futures = [pool.submit(run, job) for job in jobs]
+
+    with span("parse", "merge_chunks", series=len(codes)) as timing:
+        merged, failures = _merge(jobs, futures)
+        timing.tags["rows"] = len(merged)
+    return merged, failures
+
+
+def _merge(jobs, futures):
+    # Parça sonuçlarını Tarih üzerinde birleştirir; hatalı parçalar ayrıca döndürülür
+    pieces = {}
+    failures = []
+    for (chunk, (span_start, span_end)), future in zip(jobs, futures):
+        try:
+            data = future.result()
+        except Exception as e:
+            failures.append(ChunkFailure(chunk, span_start, span_end, e))
+            continue
+        if "Tarih" in data.columns:
+            # Parçalar arasında çakışmasın diye yalnızca istenen serilerin sütunları tutulur
+            wanted = {code.replace(".", "_") for code in chunk}
+            columns = [c for c in data.columns if c == "Tarih" or c in wanted]
+            pieces.setdefault(tuple(chunk), []).append(data[columns])
+
+    merged = pd.DataFrame({"Tarih": pd.Series(dtype="object")})
+    failed = {code for failure in failures for code in failure.codes}
+    for chunk, frames in pieces.items():
+        if failed.intersection(chunk):
+            continue
+        frame = pd.concat(frames).drop_duplicates("Tarih", keep="last")
+        merged = merged.merge(frame, on="Tarih", how="outer")
+    return merged, failures
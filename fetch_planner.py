@@ -0,0 +1,32 @@
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+import pandas as pd
+
+# Tek bir yükleme: aynı frekanstaki seriler, ortak tarih aralığı
+Request = namedtuple("Request", ["freq", "codes", "start", "end"])
+
+
+def plan(demands):
+    # demands: aynı anda karşılanacak (seriler, başlangıç, bitiş, frekans) talepleri (ör. ön
+    # hesaplamada tüm sayfalar). Frekansa göre gruplanır, çakışan veya bitişik aralıklar
+    # birleştirilir; her grup, taleplerin serilerinden oluşan tek bir Request olur. Farklı
+    # sayfaların serileri aynı EVDS isteğinde çekilir; hatalı bir parça yalnızca kendi
+    # serilerini etkiler (fetch_executor.ChunkFailure, ResultCache.get_or_load).
+    by_freq = defaultdict(list)
+    for codes, start, end, freq in demands:
+        by_freq[freq].append((pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), codes))
+
+    requests = []
+    for freq, items in by_freq.items():
+        items.sort(key=lambda item: item[0])
+        current = None
+        for start, end, codes in items:
+            if current is not None and start <= current[1] + timedelta(days=1):
+                current = (current[0], max(current[1], end), current[2] + list(codes))
+                continue
+            if current is not None:
+                requests.append(Request(freq, list(dict.fromkeys(current[2])), current[0], current[1]))
+            current = (start, end, list(codes))
+        requests.append(Request(freq, list(dict.fromkeys(current[2])), current[0], current[1]))
+    return requests
@@ -0,0 +1,47 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Yıllık volatilite için işlem günü sayısı
+TRADING_DAYS = 252
+
+# |z| bu değerin üzerindeyse getiri şok sayılır
+SHOCK_THRESHOLD = 2
+
+FxAnalytics = namedtuple(
+    "FxAnalytics",
+    ["returns", "yearly_volatility", "monthly_mean", "zscores", "shocks"],
+)
+
+
+def analyze(prices, shock_threshold=SHOCK_THRESHOLD):
+    # prices: tarih indeksli, her sütunu bir kur olan tablo.
+    # Tüm kurlar için getiriler, yıllık volatilite, aylık ortalama ve z-skorları
+    # tek bir 2 boyutlu dizi üzerinde birlikte hesaplanır.
+    values = prices.to_numpy(dtype="float64")
+    dates = pd.DatetimeIndex(prices.index)
+
+    # Günlük getiriler (ilk satır NaN)
+    returns = np.full_like(values, np.nan)
+    returns[1:] = values[1:] / values[:-1] - 1
+
+    # Z-skorlar NaN'ler atlanarak hesaplanır ve tarihlerle hizalı kalır
+    mean = np.nanmean(returns, axis=0)
+    std = np.nanstd(returns, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        zscores = (returns - mean) / std
+
+    returns = pd.DataFrame(returns, index=prices.index, columns=prices.columns)
+    zscores = pd.DataFrame(zscores, index=prices.index, columns=prices.columns)
+
+    yearly_volatility = returns.groupby(dates.year.rename("Year")).std() * np.sqrt(TRADING_DAYS)
+    monthly_mean = prices.groupby(dates.month.rename("Ay")).mean()
+
+    return FxAnalytics(
+        returns=returns,
+        yearly_volatility=yearly_volatility,
+        monthly_mean=monthly_mean,
+        zscores=zscores,
+        shocks=zscores.abs() > shock_threshold,
+    )
@@ -0,0 +1,274 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Sayfa çalıştırmalarının aşama süreleri: fetch (EVDS ve önbellekler), parse (EVDS cevabının
+# çözülmesi ve depoya yazılması), transform (birleştirme, dilimleme, interpolasyon, özetler),
+# analytics (getiri, volatilite, şok analizleri) ve render (Plotly grafikleri ve Streamlit).
+# Sayfalar her çalıştırmada bir iz (trace) açar; veri katmanı ve sayfalar aşamaları span ile
+# ölçer. Biten izler süreç geneli histogramlara eklenir ve
+#   TCMB_METRICS_FILE=yol  ile Prometheus metin dosyası olarak yazılır (node_exporter textfile),
+#   TCMB_PERF_LOG=1        ile her iz tek satır JSON olarak "perf" kaydına loglanır,
+#   TCMB_DEBUG=1 veya ?debug=1 ile kenar çubuğunda gösterilir (bkz. debug_panel).
+PHASES = ("fetch", "parse", "transform", "analytics", "render")
+
+METRICS_FILE = os.environ.get("TCMB_METRICS_FILE")
+LOG_ENABLED = os.environ.get("TCMB_PERF_LOG", "0") == "1"
+DEBUG = os.environ.get("TCMB_DEBUG", "0") == "1"
+
+# Histogram sınırları (saniye)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Bir sayfa izine bağlı olmayan ölçümlerin (arka plan yüklemesi, zamanlayıcı) sayfa etiketi
+BACKGROUND = "background"
+
+logger = logging.getLogger("perf")
+if LOG_ENABLED:
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+
+_trace = ContextVar("tcmb_perf_trace", default=None)
+_span = ContextVar("tcmb_perf_span", default=None)
+
+
+class Span:
+    """Bir aşamanın tek ölçümü.
+
+    duration toplam süre, own iç içe ölçülen span'ler hariç süredir (saniye);
+    aşama toplamları own üzerinden hesaplanır, böylece süreler iki kez sayılmaz.
+    """
+
+    __slots__ = ("phase", "name", "tags", "duration", "own", "children")
+
+    def __init__(self, phase, name, tags):
+        self.phase = phase
+        self.name = name
+        self.tags = tags
+        self.duration = 0.0
+        self.own = 0.0
+        self.children = 0.0
+
+    def to_dict(self):
+        return {"phase": self.phase, "name": self.name, "ms": round(self.own * 1000, 2), **self.tags}
+
+
+class Trace:
+    """Bir sayfa çalıştırmasında (veya fragment yeniden çalışmasında) ölçülen span'ler."""
+
+    def __init__(self, page, tags):
+        self.page = page
+        self.tags = tags
+        self.spans = []
+        self.started = time.perf_counter()
+        self.duration = None
+
+    def elapsed(self):
+        return self.duration if self.duration is not None else time.perf_counter() - self.started
+
+    def phase_totals(self):
+        totals = dict.fromkeys(PHASES, 0.0)
+        for item in self.spans:
+            totals[item.phase] = totals.get(item.phase, 0.0) + item.own
+        return totals
+
+    def to_dict(self):
+        return {
+            "page": self.page,
+            **self.tags,
+            "total_ms": round(self.elapsed() * 1000, 2),
+            "phases_ms": {phase: round(value * 1000, 2) for phase, value in self.phase_totals().items()},
+            "spans": [item.to_dict() for item in self.spans],
+        }
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+_lock = threading.Lock()
+_phase_seconds = {}
+_page_seconds = {}
+_cache_requests = {}
+_rows = {}
+
+
+@contextmanager
+def trace(page, **tags):
+    # Sayfa çalıştırmasının izi. Açık bir iz varsa (ör. fragment'ın sayfanın tam çalışması
+    # içindeki ilk çalışması) ona katılınır; iz yalnızca en dıştaki blokta kapanır.
+    current = _trace.get()
+    if current is not None:
+        yield current
+        return
+    item = Trace(page, tags)
+    token = _trace.set(item)
+    try:
+        yield item
+    finally:
+        item.duration = time.perf_counter() - item.started
+        _trace.reset(token)
+        _finish(item)
+
+
+@contextmanager
+def span(phase, name=None, **tags):
+    # Aşama ölçümü. tags serbest etiketlerdir (series, rows, cache vb.); blok içinde
+    # dönen span'in tags sözlüğüne sonradan eklenebilir (ör. satır sayısı, önbellek sonucu).
+    item = Span(phase, name or phase, tags)
+    parent = _span.get()
+    token = _span.set(item)
+    started = time.perf_counter()
+    try:
+        yield item
+    except Exception as e:
+        item.tags["error"] = type(e).__name__
+        raise
+    finally:
+        item.duration = time.perf_counter() - started
+        item.own = max(item.duration - item.children, 0.0)
+        _span.reset(token)
+        if parent is not None:
+            parent.children += item.duration
+        current = _trace.get()
+        if current is not None:
+            current.spans.append(item)
+        _record(current.page if current is not None else BACKGROUND, item)
+
+
+def _record(page, item):
+    with _lock:
+        _phase_seconds.setdefault((page, item.phase), _Histogram()).observe(item.own)
+        if "cache" in item.tags:
+            key = (page, item.name, item.tags["cache"])
+            _cache_requests[key] = _cache_requests.get(key, 0) + 1
+        if isinstance(item.tags.get("rows"), int):
+            key = (page, item.phase)
+            _rows[key] = _rows.get(key, 0) + item.tags["rows"]
+
+
+def _finish(item):
+    with _lock:
+        _page_seconds.setdefault(item.page, _Histogram()).observe(item.duration)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(item.to_dict(), default=str, ensure_ascii=False))
+    if METRICS_FILE:
+        try:
+            write_metrics(METRICS_FILE)
+        except OSError:
+            logger.exception("%s yazılamadı", METRICS_FILE)
+
+
+def _histogram_lines(name, histograms, label_names):
+    lines = []
+    for labels, histogram in sorted(histograms.items()):
+        labels = labels if isinstance(labels, tuple) else (labels,)
+        base = ",".join(f'{key}="{value}"' for key, value in zip(label_names, labels))
+        cumulative = 0
+        for bound, count in zip(BUCKETS, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{base},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{base},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{base}}} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{{{base}}} {histogram.count}")
+    return lines
+
+
+def prometheus():
+    # Süreç başından beri toplanan ölçümler, Prometheus metin biçiminde
+    with _lock:
+        lines = [
+            "# HELP tcmb_phase_seconds Sayfa aşamalarının süresi (iç içe ölçümler hariç).",
+            "# TYPE tcmb_phase_seconds histogram",
+            *_histogram_lines("tcmb_phase_seconds", _phase_seconds, ("page", "phase")),
+            "# HELP tcmb_page_seconds Sayfa çalıştırmalarının toplam süresi.",
+            "# TYPE tcmb_page_seconds histogram",
+            *_histogram_lines("tcmb_page_seconds", _page_seconds, ("page",)),
+            "# HELP tcmb_cache_requests_total Önbellek sorguları (isabet/ıska).",
+            "# TYPE tcmb_cache_requests_total counter",
+        ]
+        for (page, name, result), count in sorted(_cache_requests.items()):
+            lines.append(f'tcmb_cache_requests_total{{page="{page}",cache="{name}",result="{result}"}} {count}')
+        lines += [
+            "# HELP tcmb_rows_total Aşamalarda işlenen satır sayısı.",
+            "# TYPE tcmb_rows_total counter",
+        ]
+        for (page, phase), count in sorted(_rows.items()):
+            lines.append(f'tcmb_rows_total{{page="{page}",phase="{phase}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def totals():
+    # Süreç başından beri (sayfa, aşama) başına toplam süre (saniye); arka plan ölçümleri dahil.
+    # Ölçüm betikleri iki an arasındaki farkı alır (bkz. benchmarks/suite.py).
+    with _lock:
+        return {key: histogram.sum for key, histogram in _phase_seconds.items()}
+
+
+def write_metrics(path):
+    # Yarım yazılmış dosya okunmasın diye geçici dosya üzerinden değiştirilir
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(prometheus())
+    os.replace(tmp_path, path)
+
+
+def debug_enabled():
+    import streamlit as st
+    return DEBUG or st.query_params.get("debug") == "1"
+
+
+def debug_panel(item):
+    # Kenar çubuğunda bu çalıştırmanın aşama süreleri ve span'leri. Sayfaların veri
+    # bölümü (fragment) içinden çağrılır; bölüm yeniden çalıştığında panel de yenilenir.
+    if not debug_enabled():
+        return
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("Performans", expanded=True):
+        st.caption(f"{item.page}: {item.elapsed() * 1000:.0f} ms")
+        totals = item.phase_totals()
+        st.dataframe(
+            pd.DataFrame({"Aşama": list(totals), "ms": [round(value * 1000, 1) for value in totals.values()]}),
+            hide_index=True,
+        )
+        # Aynı adımın ölçümleri (ör. seri başına depo yazımları) tek satırda toplanır
+        steps = {}
+        for span_item in item.spans:
+            step = steps.setdefault((span_item.phase, span_item.name), {"count": 0, "own": 0.0, "rows": 0, "cache": []})
+            step["count"] += 1
+            step["own"] += span_item.own
+            if isinstance(span_item.tags.get("rows"), int):
+                step["rows"] += span_item.tags["rows"]
+            if "cache" in span_item.tags:
+                step["cache"].append(span_item.tags["cache"])
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Aşama": phase,
+                    "Adım": name,
+                    "Adet": step["count"],
+                    "ms": round(step["own"] * 1000, 1),
+                    "Satır": step["rows"],
+                    "Önbellek": ", ".join(step["cache"]),
+                }
+                for (phase, name), step in steps.items()
+            ], columns=["Aşama", "Adım", "Adet", "ms", "Satır", "Önbellek"]),
+            hide_index=True,
+        )
@@ -0,0 +1,64 @@
+import pandas as pd
+
+from artifacts import PageResult
+from catalog import CURRENCIES, page_series
+from charts import price_figure, seasonality_figure, series_figure, shock_figure
+from data_service import fx_analytics, fx_code, load_frame, load_fx, load_rollup, series_stats
+from perf import span
+
+# Sayfaların veri çekme -> temizleme -> analiz -> grafik adımları.
+# Sayfalar canlı hesaplamada, precompute.py ise çevrimdışı ön hesaplamada aynı fonksiyonları kullanır.
+
+
+def currency_page(client, currencies, start, end, frame=None):
+    # Kur Analizi: fiyatlar ("prices") ve her kur için istatistik, volatilite ve şok tabloları
+    # ile fiyat, mevsimsellik ve şok grafikleri. frame verilirse (oturumda tutulan, aralığın
+    # load_frame dilimi) veri yüklenmez, analizler ve grafikler bu tablodan hesaplanır.
+    if frame is None:
+        prices, analytics, failures = load_fx(client, currencies, start, end)
+    else:
+        (prices, analytics), failures = fx_analytics(frame, currencies), []
+    tables = {"prices": prices}
+    figures = {}
+    for currency in currencies:
+        name, color = CURRENCIES[currency]
+        price = prices[currency]
+        zscores = analytics.zscores[currency]
+        shock_mask = analytics.shocks[currency]
+        shocks = zscores[shock_mask]
+        # Azaltılmış izlerin önbellek anahtarı (seri, aralık)
+        window_key = (currency, price.index[0], price.index[-1], len(price), price.iloc[-1])
+
+        # Son gün: tüm geçmiş yeniden taranmadan artımlı istatistiklerden
+        stats = series_stats(fx_code(currency))
+        tables[f"{currency}_stats"] = pd.DataFrame({
+            "last_date": [pd.Timestamp(stats.last_date) if stats.last_date is not None else pd.NaT],
+            "rolling_volatility": [stats.rolling_volatility()],
+            "last_zscore": [stats.last_zscore()],
+            "shock": [bool(stats.is_last_shock())],
+        })
+        tables[f"{currency}_volatility"] = analytics.yearly_volatility[currency].rename(f'{currency}_Getiri').to_frame()
+        tables[f"{currency}_shocks"] = pd.DataFrame({'Tarih': shocks.index, f'{currency}_Getiri_ZScore': shocks.values})
+
+        with span("transform", "rollup", currency=currency):
+            level, rollup = load_rollup(fx_code(currency), start, end)
+        with span("render", "figures", currency=currency, rows=len(price)):
+            figures[f"{currency}_price"] = price_figure(price, name, color, level, rollup, key=window_key + ('price',))
+            figures[f"{currency}_seasonality"] = seasonality_figure(analytics.monthly_mean[currency], name)
+            figures[f"{currency}_shocks"] = shock_figure(zscores, shock_mask, name, key=window_key + ('zscore',))
+    return PageResult(tables, figures, failures)
+
+
+def series_page(client, page, start, end, build_figures=False, frame=None):
+    # Seri sayfaları: tüm seriler tek tabloda ("data"). Grafikler canlı sayfada seçildikçe
+    # oluşturulur; ön hesaplamada (build_figures) hepsi hazırlanır. frame verilirse veri yüklenmez.
+    series = page_series(page)
+    if frame is None:
+        df, failures = load_frame(client, [entry.code for entry in series], start, end, freq=series[0].freq)
+    else:
+        df, failures = frame, []
+    figures = {}
+    if build_figures:
+        with span("render", "figures", series=len(series), rows=len(df)):
+            figures = {entry.column: series_figure(df, entry.column, entry.label, entry.chart) for entry in series}
+    return PageResult({"data": df}, figures, failures)
@@ -0,0 +1,169 @@
+"""Sayfaların tablo ve grafiklerini çevrimdışı ön hesaplar.
+
+Her sayfa ve her zaman aralığı için sayfaların kullandığı veri çekme ->
+temizleme -> analiz -> grafik adımları (pipeline.py) çalıştırılır. Sonuçlar
+sürümlü bir dizine yazılır: tablolar Parquet, grafikler Plotly JSON. Sayfalar
+güncel bir çıktı bulduğunda EVDS'ye ve pandas hesaplamalarına gitmeden onu
+gösterir. Cron ile çalıştırılmak üzere tasarlanmıştır.
+
+    # Canlı EVDS'den fikstür kaydı (API_KEY gerekir)
+    python precompute.py record fixtures/
+
+    # Fikstürlerden (ağa çıkmadan) veya canlı EVDS'den ön hesaplama
+    python precompute.py build --fixtures fixtures/ --out artifacts/
+    python precompute.py build --out artifacts/
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from catalog import CURRENCIES, PAGES, SERIES, TIME_RANGE_DAYS, page_series
+
+
+def page_codes():
+    # Frekansa göre tüm kayıtlı seri kodları
+    codes = {}
+    for series in SERIES:
+        codes.setdefault(series.freq, []).append(series.code)
+    return codes
+
+
+class FixtureEvds:
+    """Kaydedilmiş fikstürlerden cevap veren, ağa çıkmayan istemci (evdsAPI.get_data arayüzü).
+
+    Dizinde her seri için EVDS'nin döndürdüğü biçimde bir CSV (Tarih ve değer
+    sütunu) ve serilerin frekanslarını tutan index.json bulunur.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+            self.index = json.load(f)
+        self._frames = {}
+
+    def _frame(self, code):
+        import pandas as pd
+        from catalog import DATE_FORMATS
+        if code not in self._frames:
+            freq = self.index["series"].get(code)
+            if freq is None:
+                raise KeyError(f"{code} için fikstür yok")
+            frame = pd.read_csv(os.path.join(self.directory, f"{code}.csv"), dtype={"Tarih": str})
+            frame["_date"] = pd.to_datetime(frame["Tarih"], format=DATE_FORMATS[freq])
+            self._frames[code] = (frame, freq)
+        return self._frames[code]
+
+    def get_data(self, series, startdate, enddate="", frequency=""):
+        import pandas as pd
+        start = pd.to_datetime(startdate, format="%d-%m-%Y")
+        end = pd.to_datetime(enddate or startdate, format="%d-%m-%Y")
+        merged = None
+        for code in series:
+            frame, freq = self._frame(code)
+            lower = start.replace(day=1) if freq == "M" else start
+            frame = frame[(frame["_date"] >= lower) & (frame["_date"] <= end)]
+            merged = frame if merged is None else merged.merge(frame, on=["Tarih", "_date"], how="outer")
+        return merged.sort_values("_date").drop(columns="_date").reset_index(drop=True)
+
+
+def record(client, directory, end):
+    # Tüm sayfa serilerini en geniş zaman aralığı için çekip fikstür olarak kaydeder
+    from fetch_executor import fetch_chunked
+    from series_store import column_name
+
+    os.makedirs(directory, exist_ok=True)
+    start = end - timedelta(days=max(TIME_RANGE_DAYS.values()))
+    index = {"recorded": end.isoformat(timespec="seconds"), "series": {}}
+    for freq, codes in page_codes().items():
+        data, failures = fetch_chunked(client, codes, start, end, freq)
+        if failures:
+            raise RuntimeError(f"{len(failures)} parça çekilemedi: {failures[0].error}")
+        for code in codes:
+            data[["Tarih", column_name(code)]].to_csv(os.path.join(directory, f"{code}.csv"), index=False)
+            index["series"][code] = freq
+    with open(os.path.join(directory, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    return index
+
+
+def build(client, out, as_of, keep):
+    # Her zaman aralığı ve sayfa için çıktılar. Tüm sayfaların serileri en geniş aralık için
+    # planlanıp frekans başına tek seferde yüklenir; diğer aralıklar önbellekten dilimlenir.
+    # Çekilemeyen parça varsa sürüm yayımlanmaz.
+    import perf
+    from artifacts import ArtifactWriter
+    from data_service import load_many
+    from pipeline import currency_page, series_page
+
+    os.makedirs(out, exist_ok=True)
+    writer = ArtifactWriter(out, as_of)
+    failures = []
+    try:
+        widest = as_of - timedelta(days=max(TIME_RANGE_DAYS.values()))
+        load_many(client, [
+            ([series.code for series in page_series(page)], widest, as_of, page_series(page)[0].freq)
+            for page in PAGES
+        ])
+        for label, days in sorted(TIME_RANGE_DAYS.items(), key=lambda item: -item[1]):
+            start = as_of - timedelta(days=days)
+            results = {}
+            for page in PAGES:
+                # TCMB_PERF_LOG / TCMB_METRICS_FILE ile aşama süreleri sayfalardaki gibi raporlanır
+                with perf.trace(page, range=label, source="precompute"):
+                    if page == "currency":
+                        results[page] = currency_page(client, list(CURRENCIES), start, as_of)
+                    else:
+                        results[page] = series_page(client, page, start, as_of, build_figures=True)
+            for page, result in results.items():
+                failures.extend(result.failures)
+                writer.add(page, days, result)
+            print(f"{label:<12} {sum(len(r.figures) for r in results.values())} grafik")
+        if failures:
+            raise RuntimeError(f"{len(failures)} parça çekilemedi: {failures[0].error}")
+    except BaseException:
+        writer.discard()
+        raise
+    return writer.commit(keep)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="canlı EVDS'den fikstür kaydet")
+    record_parser.add_argument("directory")
+
+    build_parser = commands.add_parser("build", help="sayfa çıktılarını ön hesapla")
+    build_parser.add_argument("--fixtures", help="EVDS yerine kullanılacak fikstür dizini")
+    build_parser.add_argument("--out", default=None, help="çıktı dizini (varsayılan: TCMB_ARTIFACT_DIR)")
+    build_parser.add_argument("--store", help="yerel seri deposu (fikstürlerle varsayılan: geçici dizin)")
+    build_parser.add_argument("--as-of", help="zaman aralıklarının bitişi, YYYY-AA-GG (varsayılan: şimdi)")
+    build_parser.add_argument("--keep", type=int, default=None, help="tutulacak sürüm sayısı")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        from evds_client import get_client
+        index = record(get_client(), args.directory, datetime.now())
+        print(f"{len(index['series'])} seri kaydedildi: {args.directory}")
+        return
+
+    # Veri katmanı depo dizinini içe aktarılırken okur; fikstür verisi canlı depoya karışmasın
+    if args.store or args.fixtures:
+        os.environ["TCMB_STORE_DIR"] = args.store or tempfile.mkdtemp(prefix="tcmb-precompute-")
+
+    import artifacts
+    if args.fixtures:
+        client = FixtureEvds(args.fixtures)
+    else:
+        from evds_client import get_client
+        client = get_client()
+    as_of = datetime.fromisoformat(args.as_of) if args.as_of else datetime.now()
+    version = build(client, args.out or artifacts.ARTIFACT_DIR, as_of, args.keep or artifacts.KEEP_VERSIONS)
+    print(f"sürüm {version} yazıldı")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import calendar
+import logging
+import os
+import threading
+import time as _time
+from collections import namedtuple
+from datetime import datetime, time, timedelta, timezone
+
+import data_service
+from catalog import DEFAULT_CURRENCIES, TIME_RANGE_DAYS, page_series
+from series_store import default_store
+
+logger = logging.getLogger(__name__)
+
+# Türkiye saati (2016'dan beri yaz saati uygulaması yok, sabit UTC+3)
+ISTANBUL = timezone(timedelta(hours=3), "TRT")
+
+# Yayından ne kadar sonra yenileneceği (TCMB verisinin sisteme düşmesi için pay)
+RELEASE_DELAY = timedelta(minutes=15)
+
+# Yenileme başarısız olursa yeniden deneme aralığı
+RETRY_INTERVAL = timedelta(minutes=15)
+
+# Sayfalardaki time_ranges seçenekleri (gün); en genişi çekildiğinde diğerleri önbellekten dilimlenir
+RANGE_DAYS = tuple(TIME_RANGE_DAYS.values())
+
+# cadence "daily": iş günlerinde release saatinde; "monthly": her ayın day gününde release saatinde
+Job = namedtuple("Job", ["name", "codes", "freq", "cadence", "release", "day", "precompute"])
+
+
+def _precompute_fx(client, now):
+    # Varsayılan kur seçimi için her zaman aralığında analizler hazırlanır;
+    # en geniş aralık önce yüklenir, diğerleri önbellekten dilimlenir
+    for days in sorted(RANGE_DAYS, reverse=True):
+        data_service.load_fx(client, list(DEFAULT_CURRENCIES), now - timedelta(days=days), now)
+
+
+def _page_job(name, page, cadence, release, day, precompute=None):
+    # Sayfanın kayıtlı serileri (bkz. catalog.py) için yenileme işi
+    series = page_series(page)
+    return Job(name, [entry.code for entry in series], series[0].freq, cadence, release, day, precompute)
+
+
+# Sayfaların yaklaşık yayın takvimleri (sayfa -> iş)
+PAGE_JOBS = {
+    "currency": _page_job("kur", "currency", "daily", time(15, 30), None, _precompute_fx),
+    "fiyat_endeksleri": _page_job("fiyat_endeksleri", "fiyat_endeksleri", "monthly", time(10, 0), 3),
+    "tuketici_egilim_anketi": _page_job("tuketici_egilim_anketi", "tuketici_egilim_anketi", "monthly", time(10, 0), 23),
+    "sektorel_enflasyon_verileri": _page_job("sektorel_enflasyon_verileri", "sektorel_enflasyon_verileri", "monthly", time(10, 30), 28),
+}
+DEFAULT_JOBS = tuple(PAGE_JOBS.values())
+
+
+def _is_release_day(job, day):
+    if job.cadence == "daily":
+        return day.weekday() < 5
+    return day.day == min(job.day, calendar.monthrange(day.year, day.month)[1])
+
+
+def next_run(job, after, delay=RELEASE_DELAY):
+    # after anından sonraki ilk (yayın + gecikme) anı
+    day = after.date()
+    while True:
+        if _is_release_day(job, day):
+            candidate = datetime.combine(day, job.release, tzinfo=after.tzinfo) + delay
+            if candidate > after:
+                return candidate
+        day += timedelta(days=1)
+
+
+def last_release(job, before, delay=RELEASE_DELAY):
+    # before anına kadarki son (yayın + gecikme) anı; bu andan önce hazırlanan veriler eskimiştir
+    day = before.date()
+    while True:
+        if _is_release_day(job, day):
+            candidate = datetime.combine(day, job.release, tzinfo=before.tzinfo) + delay
+            if candidate <= before:
+                return candidate
+        day -= timedelta(days=1)
+
+
+def _default_client():
+    from evds_client import get_client
+    return get_client()
+
+
+def refresh(job, client, now):
+    # Önbellekteki eski kayıtlar silinir, kuyruk yeniden sorulur ve en geniş aralık yeniden yüklenir;
+    # depo eksik kuyruğu çekerken istatistikleri ve özetleri de günceller.
+    # Sayfalar datetime.now() ile sunucunun saat dilimsiz yerel saatini kullanır; aralıklar ve
+    # analiz önbelleğinin anahtarları onlarınkiyle eşleşsin diye now bu saate çevrilir.
+    now = now.astimezone().replace(tzinfo=None)
+    data_service.shared_cache.invalidate(job.codes)
+    default_store().expire(job.codes)
+    start = now - timedelta(days=max(RANGE_DAYS))
+    _, failures = data_service.load_frame(client, job.codes, start, now, freq=job.freq)
+    if failures:
+        raise RuntimeError(f"{len(failures)} parça çekilemedi: {failures[0].error}")
+    if job.precompute is not None:
+        job.precompute(client, now)
+
+
+class PrefetchScheduler:
+    """Sayfa serilerini TCMB yayın saatlerinden kısa süre sonra arka planda yeniler.
+
+    Saat (clock), bekleme (sleep), istemci ve iş listesi dışarıdan verilebilir;
+    böylece sahte saat ve sahte istemciyle çevrimdışı çalıştırılabilir.
+    """
+
+    def __init__(self, client_factory=None, jobs=DEFAULT_JOBS, clock=None, sleep=_time.sleep,
+                 refresh=refresh, warm_on_start=True):
+        self._client_factory = client_factory or _default_client
+        self.jobs = list(jobs)
+        self._clock = clock or (lambda: datetime.now(ISTANBUL))
+        self._sleep = sleep
+        self._refresh = refresh
+        self._stop = threading.Event()
+        self._thread = None
+        now = self._clock()
+        self.due = {job.name: now if warm_on_start else next_run(job, now) for job in self.jobs}
+
+    def run_pending(self):
+        # Zamanı gelen işleri çalıştırır; çalıştırılan işlerin adlarını döndürür
+        now = self._clock()
+        ran = []
+        for job in self.jobs:
+            if now < self.due[job.name]:
+                continue
+            try:
+                self._refresh(job, self._client_factory(), now)
+            except Exception:
+                logger.exception("%s yenilenemedi", job.name)
+                self.due[job.name] = now + RETRY_INTERVAL
+            else:
+                self.due[job.name] = next_run(job, now)
+                ran.append(job.name)
+        return ran
+
+    def seconds_until_next(self):
+        return max((min(self.due.values()) - self._clock()).total_seconds(), 0)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="tcmb-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_pending()
+            # Saat atlamalarına karşı en fazla bir dakika beklenir
+            self._sleep(min(self.seconds_until_next(), 60))
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler():
+    # Süreç başına tek zamanlayıcı; TCMB_PREFETCH=0 ile kapatılabilir
+    global _scheduler
+    if os.environ.get("TCMB_PREFETCH", "1") == "0":
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PrefetchScheduler()
+            _scheduler.start()
+        return _scheduler
@@ -0,0 +1,79 @@
+import pandas as pd
+
+# Özet seviyeleri (kabadan inceye) ve pandas resample kuralları.
+# Periyotlar başlangıç tarihleriyle etiketlenir.
+LEVELS = {
+    "Y": "YS",
+    "M": "MS",
+    "W": "W-MON",
+}
+
+# Serinin kendi frekansına göre anlamlı olan özet seviyeleri
+LEVELS_BY_FREQ = {
+    "D": ["Y", "M", "W"],
+    "M": ["Y"],
+}
+
+# Bir seviyenin bir günde ürettiği yaklaşık nokta sayısı
+POINTS_PER_DAY = {
+    "Y": 1 / 365,
+    "M": 1 / 30.4,
+    "W": 1 / 7,
+    "D": 5 / 7,
+}
+
+# Bir grafiğin okunaklı olması için gereken en az nokta
+CHART_POINTS = 250
+
+AGGREGATIONS = ["mean", "last", "min", "max"]
+
+
+def period_start(date, level):
+    date = pd.Timestamp(date).normalize()
+    if level == "W":
+        return date - pd.Timedelta(days=date.dayofweek)
+    if level == "M":
+        return date.replace(day=1)
+    return date.replace(month=1, day=1)
+
+
+def rollup(frame, column, level):
+    # Ham gözlemlerden seviyeye göre ortalama, son, en küçük ve en büyük değer
+    values = frame.set_index("Tarih")[column].dropna()
+    out = values.resample(LEVELS[level], label="left", closed="left").agg(AGGREGATIONS)
+    out = out.dropna(how="all")
+    out.index.name = "Tarih"
+    return out.reset_index()
+
+
+def next_period_start(date, level):
+    start = period_start(date, level)
+    if level == "W":
+        return start + pd.Timedelta(days=7)
+    if level == "M":
+        return start + pd.DateOffset(months=1)
+    return start + pd.DateOffset(years=1)
+
+
+def update_rollup(existing, frame, column, level, first, last):
+    # Yalnızca first ile last arasındaki (değişen gözlemlerin düştüğü) periyotlar yeniden
+    # hesaplanır; önceki ve sonraki periyotların satırları olduğu gibi korunur
+    if existing is None:
+        return rollup(frame, column, level)
+    lower = period_start(first, level)
+    upper = next_period_start(last, level)
+    recent = rollup(frame[(frame["Tarih"] >= lower) & (frame["Tarih"] < upper)], column, level)
+    return pd.concat([
+        existing[existing["Tarih"] < lower],
+        recent,
+        existing[existing["Tarih"] >= upper],
+    ], ignore_index=True)
+
+
+def choose_level(start, end, freq="D", min_points=CHART_POINTS):
+    # Aralıkta en az min_points nokta veren en kaba seviye; yoksa ham veri ("D")
+    days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    for level in LEVELS_BY_FREQ.get(freq, []):
+        if days * POINTS_PER_DAY[level] >= min_points:
+            return level
+    return freq
@@ -0,0 +1,179 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from series_store import column_name
+
+# Serilerin yayımlanma sıklığına göre önbellekte kalma süreleri
+TTL_RULES = (
+    ("TP.DK.", timedelta(days=1)),
+    ("bie_", timedelta(days=30)),
+    ("TP.ENFBEK.", timedelta(days=30)),
+    ("TP.TG2.", timedelta(days=30)),
+)
+DEFAULT_TTL = timedelta(hours=1)
+
+# Önbelleğin bellek üst sınırı
+MAX_BYTES = 256 * 1024 * 1024
+
+
+def ttl_for(codes):
+    # Birden çok seri için en sık yayımlanan serinin süresi geçerlidir
+    ttls = []
+    for code in codes:
+        ttl = DEFAULT_TTL
+        for prefix, rule_ttl in TTL_RULES:
+            if code.startswith(prefix):
+                ttl = rule_ttl
+                break
+        ttls.append(ttl)
+    return min(ttls, default=DEFAULT_TTL)
+
+
+def _bounds(start, end, freq):
+    # Aralıklar serinin frekansına göre karşılaştırılır (aylık seride gün farkı önemsizdir)
+    start = pd.Timestamp(start).normalize()
+    end = pd.Timestamp(end).normalize()
+    if freq == "M":
+        return start.to_period("M"), end.to_period("M")
+    return start, end
+
+
+def select_columns(frame, codes):
+    # Seriler tabloda ardışık sütunlarsa kopyasız görünüm (iloc dilimi), değilse seçilen sütunların kopyası
+    columns = [column_name(code) for code in codes]
+    positions = frame.columns.get_indexer(columns)
+    if len(positions) and (positions >= 0).all() and (np.diff(positions) == 1).all():
+        return frame.iloc[:, positions[0]:positions[-1] + 1]
+    return frame[columns]
+
+
+def _rows(frame, freq, start, end):
+    # _bounds ile karşılaştırılabilir hale getirilmiş aralığın satırları
+    if freq == "M":
+        start, end = start.start_time, end.end_time
+    return frame.loc[start:end]
+
+
+def slice_rows(frame, freq, start, end):
+    # load_frame'in bu aralık için döndüreceği satırlar; sıralı tarih indeksi üzerinde kopyasız dilim
+    return _rows(frame, freq, *_bounds(start, end, freq))
+
+
+def _slice(frame, codes, freq, start, end):
+    # Sıralı tarih indeksi üzerinde satır ve sütun seçimi; ardışık sütunlarda veriyi kopyalamaz
+    return select_columns(_rows(frame, freq, start, end), codes)
+
+
+class _Entry:
+    def __init__(self, frame, start, end, expires_at):
+        self.frame = frame
+        self.start = start
+        self.end = end
+        self.expires_at = expires_at
+        self.nbytes = int(frame.memory_usage(index=True).sum())
+
+
+class ResultCache:
+    """Seri kümesi ve frekansa göre anahtarlanan, süreli ve LRU tahliyeli önbellek.
+
+    Her anahtar için en geniş yüklenen aralık tutulur; bu aralığın içinde kalan
+    istekler yeniden çekilmeden dilimlenerek cevaplanır. İstenen seriler daha
+    geniş bir kümenin kaydında varsa (ör. ön hesaplamada birlikte yüklenen
+    sayfalar) istek o kayıttan cevaplanır.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, clock=time.time):
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # invalidate çağrılarının sayacı (tümü ve seri başına); bkz. generation
+        self._generation = 0
+        self._generations = {}
+
+    def get(self, codes, freq, start, end):
+        wanted = frozenset(codes)
+        start, end = _bounds(start, end, freq)
+        with self._lock:
+            # Önce aynı seri kümesinin kaydına, yoksa serileri kapsayan kayıtlara bakılır
+            keys = [(wanted, freq)] + [key for key in self._entries if key[1] == freq and key[0] > wanted]
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires_at <= self._clock():
+                    self._remove(key)
+                    continue
+                if entry is not None and entry.start <= start and end <= entry.end:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _slice(entry.frame, codes, freq, start, end)
+            self.misses += 1
+        return None
+
+    def put(self, codes, freq, start, end, frame):
+        key = (frozenset(codes), freq)
+        start, end = _bounds(start, end, freq)
+        expires_at = self._clock() + ttl_for(codes).total_seconds()
+        entry = _Entry(frame, start, end, expires_at)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_load(self, codes, freq, start, end, loader):
+        # loader (tablo, hatalar) döndürür; çekilemeyen serilerin sütunları önbelleğe alınmaz,
+        # diğer seriler kendi kümeleriyle saklanır
+        frame = self.get(codes, freq, start, end)
+        if frame is not None:
+            return frame, []
+        frame, failures = loader()
+        failed = {code for failure in failures for code in failure.codes}
+        loaded = [code for code in dict.fromkeys(codes) if code not in failed]
+        if loaded:
+            self.put(loaded, freq, start, end, select_columns(frame, loaded) if failed else frame)
+        # Çağıran önbellekteki tablonun kopyasız bir dilimini alır
+        return _slice(frame, codes, freq, *_bounds(start, end, freq)), failures
+
+    def generation(self, codes):
+        # Serilerin verisinin sürümü: serilerden biri (veya tümü) geçersiz kılındıkça artar.
+        # Önbellek dışında tutulan tablolar (ör. session_cache) bununla eskidiğini anlar.
+        with self._lock:
+            return self._generation + sum(self._generations.get(code, 0) for code in codes)
+
+    def invalidate(self, codes=None):
+        # Verilen serileri içeren (veya tüm) kayıtları siler
+        with self._lock:
+            if codes is None:
+                self._generation += 1
+            else:
+                for code in set(codes):
+                    self._generations[code] = self._generations.get(code, 0) + 1
+            for key in list(self._entries):
+                if codes is None or key[0] & set(codes):
+                    self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
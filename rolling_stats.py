@@ -0,0 +1,155 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from fx_analytics import SHOCK_THRESHOLD, TRADING_DAYS
+
+# Kayan volatilite penceresi (interpolasyonlu takvim günü getirisi)
+ROLLING_WINDOW = 21
+
+# Kaydedilen istatistiklerin hesaplama kuralı; kural değiştiğinde artırılır ve eski
+# kayıtlar depodaki geçmişten yeniden kurulur (bkz. SeriesStore.stats)
+VERSION = 2
+
+
+class Welford:
+    """Sayı, ortalama ve kare farklar toplamı (M2) ile tutulan çevrimiçi varyans."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def update(self, values):
+        # Yeni değerler toplu hesaplanıp mevcut duruma birleştirilir (Chan vd.)
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        count = len(values)
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    def variance(self, ddof=1):
+        if self.count <= ddof:
+            return math.nan
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof=1):
+        return math.sqrt(self.variance(ddof))
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+
+class SeriesStats:
+    """Bir serinin tüm geçmişi için artımlı güncellenen istatistikleri.
+
+    Yıl bazında getiri varyansı, takvim ayı bazında fiyat ortalaması, tüm
+    örneklem getiri dağılımı, kayan pencere getirileri ve son gözlem tutulur.
+    Yeni gözlemler eklenirken geçmiş yeniden taranmaz.
+    """
+
+    def __init__(self):
+        self.first_date = None
+        self.last_date = None
+        self.last_value = math.nan
+        self.last_return = math.nan
+        self.returns = Welford()
+        self.yearly = {}
+        self.monthly = {}
+        self.window = []
+
+    def update(self, dates, values):
+        # Yalnızca son gözlemden sonraki tarihler işlenir. Kur sayfasının analizleriyle
+        # (data_service.fx_analytics) aynı kural geçerlidir: iki gözlem arasındaki NaN günler
+        # (hafta sonu, tatil) lineer interpolasyonla doldurulur ve getiriler bu günlerden
+        # hesaplanır. Son gözlemden sonraki NaN günler işlenmez; depo kuyruğu son gözlemden
+        # itibaren çektiği için bu günler bir sonraki güncellemede yeniden gelir.
+        series = pd.Series(np.asarray(values, dtype="float64"), index=pd.DatetimeIndex(dates))
+        if self.last_date is not None:
+            series = series[series.index > self.last_date]
+        observed = series.dropna()
+        if observed.empty:
+            return
+        series = series[series.index <= observed.index[-1]]
+        if self.last_date is not None:
+            anchor = pd.Series([self.last_value], index=pd.DatetimeIndex([self.last_date]))
+            series = pd.concat([anchor, series]).interpolate(limit_area="inside").iloc[1:]
+        else:
+            series = series.interpolate(limit_area="inside").dropna()
+
+        previous = np.concatenate([[self.last_value], series.to_numpy()[:-1]])
+        returns = pd.Series(series.to_numpy() / previous - 1, index=series.index)
+
+        self.returns.update(returns)
+        for year, group in returns.groupby(returns.index.year):
+            self.yearly.setdefault(int(year), Welford()).update(group)
+        for month, group in series.groupby(series.index.month):
+            self.monthly.setdefault(int(month), Welford()).update(group)
+
+        self.window = (self.window + [r for r in returns.tolist() if not math.isnan(r)])[-ROLLING_WINDOW:]
+        if self.first_date is None:
+            self.first_date = series.index[0]
+        self.last_date = series.index[-1]
+        self.last_value = float(series.iloc[-1])
+        self.last_return = float(returns.iloc[-1])
+
+    def yearly_volatility(self):
+        return pd.Series(
+            {year: bucket.std() * math.sqrt(TRADING_DAYS) for year, bucket in sorted(self.yearly.items())},
+            dtype="float64",
+        ).rename_axis("Year")
+
+    def monthly_mean(self):
+        return pd.Series(
+            {month: bucket.mean for month, bucket in sorted(self.monthly.items())},
+            dtype="float64",
+        ).rename_axis("Ay")
+
+    def rolling_volatility(self):
+        if len(self.window) < 2:
+            return math.nan
+        return float(np.std(self.window, ddof=1) * math.sqrt(TRADING_DAYS))
+
+    def last_zscore(self):
+        # scipy.stats.zscore ile aynı şekilde (ddof=0) tüm geçmişe göre
+        std = self.returns.std(ddof=0)
+        if math.isnan(self.last_return) or not std:
+            return math.nan
+        return (self.last_return - self.returns.mean) / std
+
+    def is_last_shock(self, threshold=SHOCK_THRESHOLD):
+        return abs(self.last_zscore()) > threshold
+
+    def to_dict(self):
+        return {
+            "version": VERSION,
+            "first_date": self.first_date.strftime("%Y-%m-%d") if self.first_date is not None else None,
+            "last_date": self.last_date.strftime("%Y-%m-%d") if self.last_date is not None else None,
+            "last_value": self.last_value,
+            "last_return": self.last_return,
+            "returns": self.returns.to_dict(),
+            "yearly": {str(year): bucket.to_dict() for year, bucket in self.yearly.items()},
+            "monthly": {str(month): bucket.to_dict() for month, bucket in self.monthly.items()},
+            "window": self.window,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.first_date = pd.Timestamp(data["first_date"]) if data["first_date"] else None
+        stats.last_date = pd.Timestamp(data["last_date"]) if data["last_date"] else None
+        stats.last_value = data["last_value"]
+        stats.last_return = data["last_return"]
+        stats.returns = Welford(**data["returns"])
+        stats.yearly = {int(year): Welford(**bucket) for year, bucket in data["yearly"].items()}
+        stats.monthly = {int(month): Welford(**bucket) for month, bucket in data["monthly"].items()}
+        stats.window = data["window"]
+        return stats
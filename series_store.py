@@ -0,0 +1,353 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from catalog import DATE_FORMATS
+from fetch_executor import fetch_chunked
+from perf import span
+from pyramid import LEVELS_BY_FREQ, update_rollup
+from rolling_stats import VERSION as STATS_VERSION, SeriesStats
+
+# Yerel veri deposunun varsayılan dizini
+STORE_DIR = os.environ.get(
+    "TCMB_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".veri"),
+)
+
+
+def column_name(code):
+    # 'TP.DK.USD.A.YTL' -> 'TP_DK_USD_A_YTL' (evds kütüphanesinin sütun adlandırması)
+    return code.replace(".", "_")
+
+
+def _day(value):
+    return pd.Timestamp(value).normalize()
+
+
+def _period_start(value, freq):
+    # Aylık serilerde gözlemler ayın ilk gününe yazılır
+    value = _day(value)
+    if freq == "M":
+        return value.replace(day=1)
+    return value
+
+
+def compact(frame):
+    # Tarih indeksli, tek bir salt okunur float32 bloktan oluşan tablo.
+    # Oturumlar bu tablonun dilimlerini kopyasız paylaşır; bir dilime yazmak
+    # (copy-on-write) yalnızca o dilimi kopyalar. Copy-on-write pandas 3'te varsayılandır
+    # (requirements.txt); daha eski sürümlerde dilime yazmak salt okunur blok hatası verir.
+    columns = [column for column in frame.columns if column != "Tarih"]
+    values = np.ascontiguousarray(frame[columns].to_numpy(dtype="float32"))
+    values.flags.writeable = False
+    index = pd.DatetimeIndex(frame["Tarih"], name="Tarih")
+    return pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+
+def _changed(stored, new, column):
+    # new satırlarından depodaki değeri farklı olanlar (yeni tarihler dahil; iki NaN eşit sayılır)
+    if not len(stored):
+        return new
+    previous = stored.set_index("Tarih")[column].reindex(new["Tarih"]).to_numpy()
+    values = new[column].to_numpy()
+    same = (previous == values) | (pd.isna(previous) & pd.isna(values))
+    return new[~same]
+
+
+class SeriesStore:
+    """Seri koduna göre Parquet dosyalarında tutulan yerel veri deposu.
+
+    Her seri için kapsanan tarih aralığı ve son gözlem tarihi manifest
+    dosyasında saklanır; EVDS'ye yalnızca eksik baş ve kuyruk aralıkları sorulur.
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        os.makedirs(os.path.join(root, "stats"), exist_ok=True)
+        os.makedirs(os.path.join(root, "rollups"), exist_ok=True)
+        self._manifest_path = os.path.join(root, "manifest.json")
+        self._manifest = self._read_manifest()
+        self._manifest_lock = threading.Lock()
+        self._series_locks = defaultdict(threading.Lock)
+        self._stats = {}
+        self._rollups = {}
+
+    def get_frame(self, client, codes, start, end, freq="D"):
+        # Eksik aralıkları çekip istenen pencereyi tek bir sıkıştırılmış tablo (bkz. compact)
+        # olarak döndürür. Çekilemeyen parçalar (ChunkFailure) tabloyla birlikte döndürülür.
+        start = _period_start(start, freq)
+        end = _day(end)
+        with span("transform", "store_frame", series=len(codes)) as timing:
+            frame, failures = self._get_frame(client, codes, start, end, freq)
+            timing.tags["rows"] = len(frame)
+        return frame, failures
+
+    def _get_frame(self, client, codes, start, end, freq):
+        with self._locked(codes):
+            failures = self._sync(client, codes, start, end, freq)
+            frames = [self._read(code) for code in codes]
+
+        df = pd.DataFrame({"Tarih": pd.Series(dtype="datetime64[ns]")})
+        for frame in frames:
+            df = df.merge(frame, on="Tarih", how="outer")
+        df = df[(df["Tarih"] >= start) & (df["Tarih"] <= end)]
+        return compact(df.sort_values("Tarih")), failures
+
+    def prepend(self, client, codes, start, end, freq="D"):
+        # Serilerin depodaki aralığından önceki boşluğu [start, from) çeker; kuyruk sorulmaz.
+        # İstatistikler ve özetler güncellenmez, seriler eskimiş işaretlenir (bkz. rebuild).
+        # Arka plan yüklemesi (backfill.py) geçmişi yıl yıl bununla ekler. Depoda hiç olmayan
+        # seriler için [start, end] çekilir. Çekilemeyen parçaları döndürür.
+        with self._locked(codes):
+            return self._sync(client, codes, _period_start(start, freq), _day(end), freq, tail=False, derived=False)
+
+    def rebuild(self, codes, freq="D"):
+        # Eskimiş serilerin istatistiklerini ve özetlerini depodaki tüm geçmişten bir kez yeniden kurar
+        with self._locked(codes):
+            for code in codes:
+                if not self._manifest.get(code, {}).get("stale"):
+                    continue
+                merged = self._read(code)
+                self._update_stats(code, merged, merged, full=True)
+                self._update_rollups(code, merged, merged, freq, full=True)
+                with self._manifest_lock:
+                    self._manifest[code]["stale"] = False
+                    self._write_manifest()
+
+    def stats(self, code):
+        # Serinin tüm geçmişi için artımlı istatistikleri (rolling_stats.SeriesStats)
+        if code not in self._stats:
+            path = self._stats_path(code)
+            data = None
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            if data is not None and data.get("version") == STATS_VERSION:
+                self._stats[code] = SeriesStats.from_dict(data)
+            else:
+                # Kayıt yoksa veya eski bir hesaplama kuralıyla yazıldıysa depodaki geçmişten kurulur
+                stats = self._stats[code] = SeriesStats()
+                stored = self._read(code)
+                stats.update(stored["Tarih"], stored[column_name(code)])
+        return self._stats[code]
+
+    def rollup(self, code, level):
+        # Serinin haftalık/aylık/yıllık özeti (Tarih, mean, last, min, max); yoksa veya
+        # özet depodaki geçmişin gerisinde kaldıysa (prepend) None
+        if self._manifest.get(code, {}).get("stale"):
+            return None
+        key = (code, level)
+        if key not in self._rollups:
+            path = self._rollup_path(code, level)
+            self._rollups[key] = pd.read_parquet(path) if os.path.exists(path) else None
+        return self._rollups[key]
+
+    def last_observation(self, code):
+        entry = self._manifest.get(code)
+        if entry is None or entry["last"] is None:
+            return None
+        return pd.Timestamp(entry["last"])
+
+    def covered_from(self, codes):
+        # Serilerin hepsinin yerel depoda kapsandığı en erken tarih; kapsanmayan seri varsa None
+        with self._manifest_lock:
+            entries = [self._manifest.get(code) for code in codes]
+        if not entries or any(entry is None for entry in entries):
+            return None
+        return max(pd.Timestamp(entry["from"]) for entry in entries)
+
+    def expire(self, codes):
+        # Serilerin kuyruğu bir sonraki okumada bugün sorulmuş olsa da yeniden çekilir
+        # (ör. yayın saatinden sonra, bkz. prefetch.refresh)
+        with self._manifest_lock:
+            for code in codes:
+                if code in self._manifest:
+                    self._manifest[code]["checked"] = None
+            self._write_manifest()
+
+    @contextmanager
+    def _locked(self, codes):
+        with self._manifest_lock:
+            locks = [self._series_locks[code] for code in sorted(set(codes))]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def _sync(self, client, codes, start, end, freq, tail=True, derived=True):
+        # Aynı eksik aralığa sahip serileri tek istekte toplar
+        pending = defaultdict(list)
+        for code in codes:
+            for missing in self._missing_ranges(code, start, end, tail):
+                pending[missing].append(code)
+
+        failures = []
+        for (range_start, range_end), group in pending.items():
+            data, group_failures = fetch_chunked(client, group, range_start, range_end, freq)
+            # Hatalı parçadaki seriler kapsanmış sayılmaz; bir sonraki istekte yeniden denenir
+            failed = {code for failure in group_failures for code in failure.codes}
+            self._append([code for code in group if code not in failed], data, range_start, range_end, freq, derived)
+            failures.extend(group_failures)
+        return failures
+
+    def _missing_ranges(self, code, start, end, tail=True):
+        entry = self._manifest.get(code)
+        if entry is None:
+            return [(start, end)]
+
+        ranges = []
+        covered_from = pd.Timestamp(entry["from"])
+        covered_to = pd.Timestamp(entry["to"])
+        if start < covered_from:
+            ranges.append((start, covered_from - timedelta(days=1)))
+        if tail and end > covered_to and entry.get("checked") != _day(datetime.now()).strftime("%Y-%m-%d"):
+            # Son gözlem yeniden çekilir; geç yayımlanan veya revize edilen değerler yakalanır.
+            # Kuyruk bugün zaten sorulduysa (checked) yeniden sorulmaz; bkz. expire
+            tail_start = pd.Timestamp(entry["last"]) if entry["last"] else covered_to
+            ranges.append((tail_start, end))
+        return ranges
+
+    def _append(self, codes, data, range_start, range_end, freq, derived=True):
+        with span("parse", "store_append", series=len(codes), rows=len(data)):
+            self._append_rows(codes, data, range_start, range_end, freq, derived)
+
+    def _append_rows(self, codes, data, range_start, range_end, freq, derived):
+        if "Tarih" in data.columns:
+            data["Tarih"] = pd.to_datetime(data["Tarih"], format=DATE_FORMATS[freq])
+            data = data.sort_values("Tarih")
+        else:
+            data = pd.DataFrame({"Tarih": pd.Series(dtype="datetime64[ns]")})
+
+        # Bugünün verisi henüz yayımlanmamış olabilir; bugün kapsanmış sayılmaz
+        today = _day(datetime.now())
+        yesterday = today - timedelta(days=1)
+        for code in codes:
+            column = column_name(code)
+            new = data[["Tarih"]].copy()
+            new[column] = data[column].astype("float64") if column in data.columns else float("nan")
+
+            stored = self._read(code)
+            merged = pd.concat([stored, new]) if len(stored) else new
+            merged = merged.drop_duplicates("Tarih", keep="last").sort_values("Tarih")
+            self._write(code, merged)
+            entry = self._manifest.get(code, {})
+            stale = entry.get("stale", False)
+            if derived:
+                # Eskimiş seride (prepend) istatistikler ve özetler tüm geçmişten kurulur
+                self._update_stats(code, merged, new, full=stale)
+                self._update_rollups(code, merged, _changed(stored, new, column), freq, full=stale)
+                stale = False
+            else:
+                stale = True
+
+            observed = merged.loc[merged[column].notna(), "Tarih"]
+            covered_from = min(pd.Timestamp(entry.get("from", range_start)), range_start)
+            covered_to = max(pd.Timestamp(entry.get("to", range_start)), min(range_end, yesterday))
+            # Kuyruğun (bugünün verisinin) EVDS'ye en son sorulduğu gün
+            checked = entry.get("checked")
+            if range_end >= today:
+                checked = today.strftime("%Y-%m-%d")
+            with self._manifest_lock:
+                self._manifest[code] = {
+                    "freq": freq,
+                    "from": covered_from.strftime("%Y-%m-%d"),
+                    "to": covered_to.strftime("%Y-%m-%d"),
+                    "last": observed.max().strftime("%Y-%m-%d") if len(observed) else None,
+                    "checked": checked,
+                    "stale": stale,
+                }
+                self._write_manifest()
+
+    def _update_stats(self, code, merged, new, full=False):
+        # Yeni gözlemler yalnızca eklenir; geçmişe doğru veri geldiyse durum baştan kurulur
+        column = column_name(code)
+        stats = self.stats(code)
+        observed = new.loc[new[column].notna(), "Tarih"]
+        if full or stats.first_date is not None and len(observed) and observed.min() < stats.first_date:
+            stats = self._stats[code] = SeriesStats()
+            new = merged
+        with span("analytics", "rolling_stats", rows=len(new)):
+            stats.update(new["Tarih"], new[column])
+
+        path = self._stats_path(code)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stats.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    def _update_rollups(self, code, merged, changed, freq, full=False):
+        # Yalnızca değeri değişen (eklenen, revize edilen veya silinen) gözlemlerin düştüğü
+        # periyotlar yeniden hesaplanır; değişiklik yoksa özetlere dokunulmaz. full ile
+        # özetler tüm geçmişten kurulur
+        column = column_name(code)
+        first, last = changed["Tarih"].min(), changed["Tarih"].max()
+        for level in LEVELS_BY_FREQ.get(freq, []):
+            existing = None if full else self.rollup(code, level)
+            if existing is not None and not len(changed):
+                continue
+            with span("transform", "rollup", level=level):
+                frame = update_rollup(existing, merged, column, level, first, last)
+            path = self._rollup_path(code, level)
+            tmp_path = f"{path}.tmp"
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+            self._rollups[(code, level)] = frame
+
+    def _rollup_path(self, code, level):
+        return os.path.join(self.root, "rollups", f"{code}.{level}.parquet")
+
+    def _stats_path(self, code):
+        return os.path.join(self.root, "stats", f"{code}.json")
+
+    def _path(self, code):
+        return os.path.join(self.root, f"{code}.parquet")
+
+    def _read(self, code):
+        path = self._path(code)
+        if not os.path.exists(path):
+            return pd.DataFrame({
+                "Tarih": pd.Series(dtype="datetime64[ns]"),
+                column_name(code): pd.Series(dtype="float64"),
+            })
+        return pd.read_parquet(path)
+
+    def _write(self, code, frame):
+        # Yarım yazılmış dosya okunmasın diye geçici dosya üzerinden değiştirilir
+        path = self._path(code)
+        tmp_path = f"{path}.tmp"
+        frame.reset_index(drop=True).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _read_manifest(self):
+        if not os.path.exists(self._manifest_path):
+            return {}
+        with open(self._manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        tmp_path = f"{self._manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._manifest_path)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def default_store():
+    # Tüm oturumlar ve yeniden çalıştırmalar aynı depoyu paylaşır
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = SeriesStore()
+        return _default_store
@@ -0,0 +1,72 @@
+import streamlit as st
+from datetime import datetime
+
+import catalog
+from catalog import TIME_RANGE_DAYS, page_series
+
+
+def series_page_view(page):
+    # Seri sayfalarının (fiyat endeksleri, sektörel enflasyon, tüketici eğilim) ortak gövdesi.
+    # Veri isteği oturumda tutulur, böylece zaman aralığı değiştiğinde tüm sayfa değil yalnızca
+    # veri bölümü yeniden çalışır. Sayfanın serileri, başlıkları ve grafik türleri catalog.py'dedir.
+    if st.sidebar.button("Verileri Getir"):
+        # Düğmeye yeniden basılınca oturumdaki tablo bırakılır ve veri yeniden yüklenir
+        st.session_state[f"{page}_requested"] = True
+        st.session_state.pop(f"{page}_loaded", None)
+
+    if not st.session_state.get(f"{page}_requested"):
+        st.sidebar.info("Verileri görmek için 'Verileri Getir' butonuna basın; zaman aralığı sayfada seçilir.")
+        return
+
+    # Ağır modüller (pandas, plotly, veri katmanı) yalnızca veri istendiğinde yüklenir
+    import perf
+    import session_cache
+    from artifacts import load as load_artifact
+    from charts import series_picker
+
+    # Tarih aralığı seçenekleri; aralık sayfada, grafiklerin üstünde seçilir
+    today = datetime.now()
+    time_ranges = catalog.time_ranges(today)
+    end_date = today
+    series = page_series(page)
+    codes = [entry.code for entry in series]
+
+    @st.fragment
+    def view():
+        # Aralık oturumda yüklenmiş en geniş aralığın içindeyse veri yerel olarak dilimlenir
+        selected_range = st.radio("Zaman Aralığı", list(time_ranges.keys()), horizontal=True, key=f"{page}_range")
+        start_date = time_ranges[selected_range]
+        with perf.trace(page, range=selected_range) as trace:
+            try:
+                # Ön hesaplanmış çıktı (precompute.py) varsa doğrudan gösterilir
+                artifact = load_artifact(page, TIME_RANGE_DAYS[selected_range])
+                frame = session_cache.lookup(st.session_state, page, codes, start_date, end_date, freq=series[0].freq)
+                if artifact is not None:
+                    result, as_of = artifact
+                    st.caption(f"Veriler {as_of:%d-%m-%Y %H:%M} tarihli ön hesaplamadan gösteriliyor.")
+                elif frame is not None:
+                    from pipeline import series_page
+                    result = series_page(None, page, start_date, end_date, frame=frame)
+                else:
+                    from evds_client import get_client
+                    from pipeline import series_page
+
+                    # Tüm sayfaların paylaştığı EVDS istemcisi (bağlantı havuzu ve yeniden deneme ile)
+                    evds = get_client()
+                    generation = session_cache.current(codes)
+                    with st.spinner("Veriler çekiliyor..."):
+                        # Verileri çek (önbellekte veya yerel depoda olmayan aralıklar EVDS'den çekilir)
+                        result = series_page(evds, page, start_date, end_date)
+                    for failure in result.failures:
+                        st.warning(f"{', '.join(failure.codes)} serileri alınamadı: {failure.error}")
+                    if not result.failures:
+                        session_cache.remember(st.session_state, page, codes, start_date, end_date, result.tables["data"], generation)
+
+                # Grafikler yalnızca seçilen seriler için oluşturulup gönderilir
+                series_picker(result.tables["data"], series, figures=result.figures)
+
+            except Exception as e:
+                st.error(f"Veri alınırken bir hata oluştu: {str(e)}")
+            perf.debug_panel(trace)
+
+    view()
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from perf import span
+from result_cache import slice_rows
+
+# Oturum başına, bir sayfanın o ana kadar yüklediği en geniş aralığın tablosu.
+# state olarak st.session_state verilir. Tablo veri katmanının paylaşılan salt okunur
+# tablosunun kopyasız dilimidir; oturum başına ek bellek yalnızca birkaç nesnedir.
+# Daha dar bir aralık seçildiğinde veri bu tablodan dilimlenir; EVDS'ye, yerel depoya ve
+# süreç önbelleğine gidilmez. Seriler süreç önbelleğinde geçersiz kılındıysa (ör. yayın
+# sonrası prefetch.refresh) tablo eskimiş sayılır ve yeniden yüklenir.
+
+
+def _key(page):
+    return f"{page}_loaded"
+
+
+def _generation(codes):
+    from data_service import shared_cache
+    return shared_cache.generation(codes)
+
+
+def lookup(state, page, codes, start, end, freq="D"):
+    # Oturumdaki tablo aynı seriler için bu aralığı kapsıyorsa ve eskimediyse aralığın dilimi,
+    # değilse None
+    with span("transform", "session", series=len(codes)) as timing:
+        entry = state.get(_key(page))
+        start = pd.Timestamp(start).normalize()
+        end = pd.Timestamp(end).normalize()
+        if (entry is None or entry["codes"] != tuple(codes) or entry["end"] != end or start < entry["start"]
+                or entry["generation"] != _generation(codes)):
+            timing.tags["cache"] = "miss"
+            return None
+        frame = slice_rows(entry["frame"], freq, start, end)
+        timing.tags.update(cache="hit", rows=len(frame))
+    return frame
+
+
+def remember(state, page, codes, start, end, frame, generation):
+    # Yüklenen tablo oturumdakinden genişse (veya gün, seriler ya da veri sürümü değiştiyse)
+    # onun yerine geçer. generation, tablo yüklenmeden önce okunan veri sürümüdür (bkz.
+    # current); yükleme sırasında geçersiz kılınan tablo bir sonraki aramada eskimiş sayılır.
+    start = pd.Timestamp(start).normalize()
+    end = pd.Timestamp(end).normalize()
+    entry = state.get(_key(page))
+    if (entry is not None and entry["codes"] == tuple(codes) and entry["end"] == end and entry["start"] <= start
+            and entry["generation"] == generation):
+        return
+    state[_key(page)] = {"codes": tuple(codes), "start": start, "end": end, "frame": frame, "generation": generation}
+
+
+def current(codes):
+    # Serilerin şu anki veri sürümü; remember'a verilmek üzere yüklemeden önce okunur
+    return _generation(codes)
@@ -0,0 +1,54 @@
+import threading
+from concurrent.futures import Future
+
+
+class _Flight:
+    def __init__(self):
+        self.future = Future()
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Aynı anahtar için eşzamanlı çağrıları tek bir çalıştırmada birleştirir.
+
+    Bir anahtar için çalışma sürerken gelen çağrılar yeni bir çalışma
+    başlatmaz, süren çalışmanın sonucunu bekler.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        # (sonuç, paylaşıldı_mı) döndürür; paylaşılan sonuç başka çağıranlara da verilmiştir
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.executions += 1
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            return flight.future.result(), True
+
+        try:
+            flight.future.set_result(fn())
+        except BaseException as e:
+            flight.future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return flight.future.result(), flight.waiters > 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "inflight": len(self._inflight),
+            }
@@ -1,13 +1,22 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from evds import evdsAPI
-from datetime import datetime, timedelta
-import plotly.graph_objects as go
-import os 
+import os
+import sys
+import threading
 
 st.set_page_config(layout="wide")
+
+
+def start_prefetch():
+    # Zamanlayıcı ve veri katmanı (pandas, pyarrow vb.) ilk çizimi bekletmesin diye arka planda yüklenir
+    from prefetch import start_scheduler
+    start_scheduler()
+
+
+# TCMB yayınlarından sonra verileri arka planda yenileyen zamanlayıcı (süreç başına bir kez);
+# TCMB_PREFETCH=0 ile kapatılabilir
+if os.environ.get("TCMB_PREFETCH", "1") != "0" and "prefetch" not in sys.modules:
+    threading.Thread(target=start_prefetch, name="tcmb-prefetch-start", daemon=True).start()
+
 pages = {
     "Kur": [
         st.Page("currency.py", title="Kur Analizi"),
@@ -20,4 +29,4 @@ pages = {
 }
 
 pg = st.navigation(pages)
-pg.run()
\ No newline at end of file
+pg.run()
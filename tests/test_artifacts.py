@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from artifacts import ArtifactWriter, PageResult, load
+from prefetch import ISTANBUL
+
+
+def _local(*args):
+    # İstanbul saatindeki anın sunucunun yerel saatindeki (saat dilimsiz) karşılığı
+    return datetime(*args, tzinfo=ISTANBUL).astimezone().replace(tzinfo=None)
+
+
+@pytest.fixture
+def root(tmp_path):
+    # 2024-06-17 Pazartesi 02:00 (İstanbul) tarihli gece ön hesaplaması
+    writer = ArtifactWriter(str(tmp_path), _local(2024, 6, 17, 2, 0))
+    table = pd.DataFrame({"USD": [1.0]})
+    for page in ("currency", "fiyat_endeksleri"):
+        writer.add(page, 30, PageResult({"data": table}, {}, []))
+    writer.commit()
+    return str(tmp_path)
+
+
+def test_artifact_is_used_until_next_release(root):
+    assert load("currency", 30, root=root, now=_local(2024, 6, 17, 15, 0)) is not None
+    assert load("currency", 30, root=root, now=_local(2024, 6, 17, 15, 50)) is None
+
+
+def test_monthly_page_artifact_outlives_fx_release(root):
+    now = _local(2024, 6, 17, 20, 0)
+    assert load("fiyat_endeksleri", 30, root=root, now=now) is not None
+    assert load("fiyat_endeksleri", 30, root=root, now=now, max_age=timedelta(hours=12)) is None
+    assert load("fiyat_endeksleri", 30, root=root, now=_local(2024, 7, 3, 11, 0), max_age=timedelta(days=30)) is None
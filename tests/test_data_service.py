@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import data_service
+import series_store
+from catalog import page_series
+from result_cache import ResultCache
+from series_store import SeriesStore, column_name
+from test_series_store import StubEvds
+
+MONTHLY_PAGES = ("fiyat_endeksleri", "tuketici_egilim_anketi", "sektorel_enflasyon_verileri")
+
+
+@pytest.fixture(autouse=True)
+def fresh_layers(tmp_path, monkeypatch):
+    # Her test boş bir depo ve önbellekle çalışır
+    monkeypatch.setattr(series_store, "_default_store", SeriesStore(root=str(tmp_path)))
+    monkeypatch.setattr(data_service, "shared_cache", ResultCache())
+
+
+def _demands():
+    end = datetime.now() - timedelta(days=40)
+    start = end - timedelta(days=10 * 365)
+    return [([entry.code for entry in page_series(page)], start, end, "M") for page in MONTHLY_PAGES]
+
+
+def test_load_many_shares_requests_across_pages():
+    demands = _demands()
+    separate = StubEvds()
+    for codes, start, end, freq in demands:
+        data_service.load_frame(separate, codes, start, end, freq)
+
+    data_service.shared_cache.invalidate([code for codes, *_ in demands for code in codes])
+    series_store._default_store = SeriesStore(root=series_store._default_store.root + "-many")
+    merged = StubEvds()
+    results = data_service.load_many(merged, demands)
+
+    total = sum(len(codes) for codes, *_ in demands)
+    assert len(merged.requests) == -(-total // 5) < len(separate.requests)
+    for (codes, *_), (frame, failures) in zip(demands, results):
+        assert failures == []
+        assert list(frame.columns) == [column_name(code) for code in codes]
+
+
+def test_failed_chunk_only_affects_its_own_codes():
+    demands = _demands()
+    failing = demands[0][0][0]
+    client = StubEvds(failing={failing})
+
+    results = data_service.load_many(client, demands)
+
+    failed = {code for _, failures in results for failure in failures for code in failure.codes}
+    assert failing in failed and len(failed) <= 5
+    for (codes, *_), (frame, failures) in zip(demands, results):
+        for code in codes:
+            assert frame[column_name(code)].isna().all() == (code in failed)
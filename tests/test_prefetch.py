@@ -0,0 +1,106 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from prefetch import ISTANBUL, RELEASE_DELAY, RETRY_INTERVAL, Job, PrefetchScheduler, last_release, next_run
+
+FX = Job("kur", ["TP.DK.USD.S.YTL"], "D", "daily", time(15, 30), None, None)
+CPI = Job("fiyat_endeksleri", ["bie_tukfiy4"], "M", "monthly", time(10, 0), 31, None)
+
+
+def _at(*args):
+    return datetime(*args, tzinfo=ISTANBUL)
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_daily_job_runs_on_weekdays_only():
+    # 2024-06-14 Cuma; yayından sonra bir sonraki çalışma Pazartesi
+    assert next_run(FX, _at(2024, 6, 14, 16, 0)) == _at(2024, 6, 17, 15, 30) + RELEASE_DELAY
+    assert next_run(FX, _at(2024, 6, 15, 9, 0)) == _at(2024, 6, 17, 15, 30) + RELEASE_DELAY
+
+
+def test_same_day_before_and_after_release():
+    release = _at(2024, 6, 12, 15, 30) + RELEASE_DELAY
+    assert next_run(FX, _at(2024, 6, 12, 9, 0)) == release
+    # Yayın saati geçti ama gecikme dolmadı: aynı gün
+    assert next_run(FX, _at(2024, 6, 12, 15, 35)) == release
+    assert next_run(FX, release) == _at(2024, 6, 13, 15, 30) + RELEASE_DELAY
+
+
+@pytest.mark.parametrize("after, expected", [
+    (_at(2024, 2, 1, 0, 0), _at(2024, 2, 29, 10, 0)),
+    (_at(2023, 2, 1, 0, 0), _at(2023, 2, 28, 10, 0)),
+    (_at(2024, 4, 30, 11, 0), _at(2024, 5, 31, 10, 0)),
+    (_at(2024, 1, 31, 9, 0), _at(2024, 1, 31, 10, 0)),
+])
+def test_monthly_job_clamps_to_short_months(after, expected):
+    assert next_run(CPI, after) == expected + RELEASE_DELAY
+
+
+def test_failed_refresh_is_retried_after_interval():
+    clock = FakeClock(_at(2024, 6, 12, 15, 50))
+    calls = []
+
+    def refresh(job, client, now):
+        calls.append(now)
+        if len(calls) == 1:
+            raise ConnectionError("EVDS erişilemedi")
+
+    scheduler = PrefetchScheduler(client_factory=object, jobs=[FX], clock=clock, refresh=refresh)
+
+    assert scheduler.run_pending() == []
+    assert scheduler.due["kur"] == clock.now + RETRY_INTERVAL
+
+    clock.now += RETRY_INTERVAL - timedelta(seconds=1)
+    assert scheduler.run_pending() == []
+    assert len(calls) == 1
+
+    clock.now += timedelta(seconds=1)
+    assert scheduler.run_pending() == ["kur"]
+    assert scheduler.due["kur"] == next_run(FX, clock.now)
+
+
+def test_successful_refresh_is_rescheduled_for_next_release():
+    clock = FakeClock(_at(2024, 6, 14, 15, 0))
+    ran = []
+    scheduler = PrefetchScheduler(client_factory=object, jobs=[FX, CPI], clock=clock,
+                                  refresh=lambda job, client, now: ran.append(job.name), warm_on_start=False)
+    friday = _at(2024, 6, 14, 15, 30) + RELEASE_DELAY
+    assert scheduler.due == {"kur": friday, "fiyat_endeksleri": _at(2024, 6, 30, 10, 0) + RELEASE_DELAY}
+    assert scheduler.run_pending() == []
+    assert scheduler.seconds_until_next() == (friday - clock.now).total_seconds()
+
+    clock.now = friday
+    assert scheduler.run_pending() == ["kur"]
+    assert scheduler.due["kur"] == _at(2024, 6, 17, 15, 30) + RELEASE_DELAY
+    assert scheduler.run_pending() == []
+    assert ran == ["kur"]
+
+
+def test_last_release_is_latest_release_before():
+    assert last_release(FX, _at(2024, 6, 17, 9, 0)) == _at(2024, 6, 14, 15, 30) + RELEASE_DELAY
+    assert last_release(FX, _at(2024, 6, 17, 15, 45)) == _at(2024, 6, 17, 15, 30) + RELEASE_DELAY
+    assert last_release(CPI, _at(2024, 3, 15, 0, 0)) == _at(2024, 2, 29, 10, 0) + RELEASE_DELAY
+
+
+def test_refresh_uses_server_local_time(monkeypatch):
+    import data_service
+    import prefetch
+
+    loads = []
+    monkeypatch.setattr(data_service, "load_frame", lambda client, codes, start, end, freq: loads.append((start, end)) or (None, []))
+    monkeypatch.setattr(prefetch, "default_store", lambda: type("Store", (), {"expire": lambda self, codes: None})())
+
+    # İstanbul'da gece yarısından hemen önce; UTC sunucuda saat 21:30
+    now = _at(2024, 6, 14, 23, 30)
+    prefetch.refresh(FX, None, now)
+
+    local = now.astimezone().replace(tzinfo=None)
+    assert loads == [(local - timedelta(days=max(prefetch.RANGE_DAYS)), local)]
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyramid import next_period_start, period_start, rollup, update_rollup
+from series_store import SeriesStore, column_name
+from synthetic import SyntheticEvds
+
+USD = "TP.DK.USD.S.YTL"
+COLUMN = column_name(USD)
+
+
+def _frame(start, end):
+    dates = pd.bdate_range(start, end)
+    values = np.linspace(10, 20, len(dates))
+    return pd.DataFrame({"Tarih": dates, COLUMN: values})
+
+
+@pytest.mark.parametrize("level", ["Y", "M", "W"])
+def test_period_bounds(level):
+    date = pd.Timestamp("2024-02-29 15:30")
+    start = period_start(date, level)
+    assert start <= date < next_period_start(date, level)
+    assert next_period_start(date, level) == next_period_start(next_period_start(date, level) - timedelta(days=1), level)
+
+
+@pytest.mark.parametrize("level", ["Y", "M", "W"])
+def test_update_rollup_recomputes_only_touched_periods(level):
+    frame = _frame("2020-01-01", "2024-06-28")
+    existing = rollup(frame, COLUMN, level)
+
+    # Ortadaki bir gözlem revize edilir; yalnızca onun periyodu değişir
+    revised = frame.copy()
+    date = pd.Timestamp("2022-05-18")
+    revised.loc[revised["Tarih"] == date, COLUMN] = 99.0
+    updated = update_rollup(existing, revised, COLUMN, level, date, date)
+
+    pd.testing.assert_frame_equal(updated, rollup(revised, COLUMN, level))
+    touched = updated["Tarih"] == period_start(date, level)
+    pd.testing.assert_frame_equal(updated[~touched], existing[~touched])
+
+
+def test_update_rollup_splices_head_and_tail():
+    frame = _frame("2020-01-01", "2024-06-28")
+    middle = frame[(frame["Tarih"] >= "2021-03-10") & (frame["Tarih"] <= "2023-08-15")]
+    existing = rollup(middle, COLUMN, "M")
+
+    head = frame[frame["Tarih"] <= "2023-08-15"]
+    updated = update_rollup(existing, head, COLUMN, "M", head["Tarih"].min(), pd.Timestamp("2021-03-09"))
+    pd.testing.assert_frame_equal(updated, rollup(head, COLUMN, "M"))
+
+    updated = update_rollup(updated, frame, COLUMN, "M", pd.Timestamp("2023-08-16"), frame["Tarih"].max())
+    pd.testing.assert_frame_equal(updated, rollup(frame, COLUMN, "M"))
+
+
+def test_unchanged_sync_leaves_rollups_alone(tmp_path, monkeypatch):
+    store = SeriesStore(root=str(tmp_path))
+    client = SyntheticEvds()
+    today = pd.Timestamp(datetime.now()).normalize()
+    store.get_frame(client, [USD], today - timedelta(days=90), today)
+    rollups = {level: store.rollup(USD, level) for level in ("Y", "M", "W")}
+    assert all(frame is not None for frame in rollups.values())
+
+    calls = []
+    monkeypatch.setattr("series_store.update_rollup", lambda *args: calls.append(args))
+    store.expire([USD])
+    store.get_frame(client, [USD], today - timedelta(days=90), today)
+
+    assert calls == []
+    assert all(store.rollup(USD, level) is rollups[level] for level in rollups)
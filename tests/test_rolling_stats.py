@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fx_analytics import analyze
+from rolling_stats import ROLLING_WINDOW, TRADING_DAYS, SeriesStats
+from series_store import column_name
+from synthetic import SyntheticEvds
+
+USD = "TP.DK.USD.S.YTL"
+
+
+def _frame(start, end):
+    df = SyntheticEvds().get_data([USD], start, end)
+    return pd.Series(df[column_name(USD)].to_numpy(), index=pd.to_datetime(df["Tarih"], format="%d-%m-%Y"))
+
+
+def test_stats_match_page_analytics():
+    # Kur sayfası fiyatları interpolasyonla doldurup analiz eder; artımlı istatistikler aynı sonucu verir
+    values = _frame("01-01-2023", "31-12-2024")
+    stats = SeriesStats()
+    stats.update(values.index, values)
+
+    prices = values.interpolate().to_frame("USD")
+    analytics = analyze(prices)
+    yearly = analytics.yearly_volatility["USD"]
+    assert stats.yearly_volatility()[2024] == pytest.approx(yearly[2024])
+    assert stats.yearly_volatility()[2023] == pytest.approx(yearly[2023])
+    returns = analytics.returns["USD"].dropna()
+    assert stats.rolling_volatility() == pytest.approx(returns.iloc[-ROLLING_WINDOW:].std() * np.sqrt(TRADING_DAYS))
+
+
+def test_incremental_update_matches_single_pass():
+    values = _frame("01-01-2024", "30-06-2024")
+    whole = SeriesStats()
+    whole.update(values.index, values)
+
+    # Parçalar hafta sonunda biter; depo kuyruğu gibi sonraki parça son gözlemden (Cuma) başlar
+    # ve aradaki NaN günler o parçada doldurulur
+    parts = SeriesStats()
+    for lower, upper in [("2024-01-01", "2024-02-10"), ("2024-02-09", "2024-04-06"), ("2024-04-05", "2024-06-30")]:
+        part = values[lower:upper]
+        parts.update(part.index, part)
+
+    assert parts.last_date == whole.last_date
+    assert parts.window == pytest.approx(whole.window)
+    assert parts.returns.std() == pytest.approx(whole.returns.std())
+    assert parts.yearly_volatility().to_dict() == pytest.approx(whole.yearly_volatility().to_dict())
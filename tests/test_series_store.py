@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from pyramid import rollup
+from series_store import SeriesStore, _period_start, column_name
+from synthetic import SyntheticEvds
+
+USD = "TP.DK.USD.S.YTL"
+CPI = "bie_tukfiy4"
+
+
+class StubEvds(SyntheticEvds):
+    """İstekleri kaydeden, istenen serilerde hata veren ve değer revizyonu uygulayabilen sahte istemci."""
+
+    def __init__(self, failing=()):
+        super().__init__()
+        self.requests = []
+        self.failing = set(failing)
+        self.revisions = {}
+
+    def get_data(self, series, startdate, enddate="", frequency=""):
+        self.requests.append((tuple(series), pd.to_datetime(startdate, format="%d-%m-%Y"),
+                              pd.to_datetime(enddate, format="%d-%m-%Y")))
+        if self.failing.intersection(series):
+            raise ConnectionError("EVDS erişilemedi")
+        df = super().get_data(series, startdate, enddate)
+        for (code, date), value in self.revisions.items():
+            df.loc[df["Tarih"] == date, column_name(code)] = value
+        return df
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SeriesStore(root=str(tmp_path))
+
+
+def _today():
+    return pd.Timestamp(datetime.now()).normalize()
+
+
+def test_first_request_fetches_whole_range(store):
+    client = StubEvds()
+    end = _today() - timedelta(days=30)
+    start = end - timedelta(days=60)
+
+    frame, failures = store.get_frame(client, [USD], start, end)
+
+    assert failures == []
+    assert client.requests == [((USD,), start, end)]
+    assert frame.index.min() >= start and frame.index.max() <= end
+    entry = store._manifest[USD]
+    assert (entry["from"], entry["to"]) == (start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+
+
+def test_only_head_and_tail_gaps_are_fetched(store):
+    client = StubEvds()
+    today = _today()
+    store.get_frame(client, [USD], today - timedelta(days=100), today - timedelta(days=50))
+    last = store.last_observation(USD)
+    client.requests.clear()
+
+    store.get_frame(client, [USD], today - timedelta(days=200), today)
+
+    assert sorted(request[1:] for request in client.requests) == [
+        (today - timedelta(days=200), today - timedelta(days=101)),
+        (last, today),
+    ]
+    # Tekrar istendiğinde eksik aralık kalmaz
+    assert store._missing_ranges(USD, today - timedelta(days=200), today) == []
+
+
+def test_tail_checked_today_is_not_fetched_again(store):
+    client = StubEvds()
+    today = _today()
+    store.get_frame(client, [USD], today - timedelta(days=30), today)
+    client.requests.clear()
+
+    store.get_frame(client, [USD], today - timedelta(days=30), today)
+    assert client.requests == []
+
+    # Yayın sonrası yenilemede kuyruk son gözlemden itibaren yeniden sorulur
+    store.expire([USD])
+    store.get_frame(client, [USD], today - timedelta(days=30), today)
+    assert client.requests == [((USD,), store.last_observation(USD), today)]
+
+
+def test_failed_chunk_codes_stay_uncovered(store):
+    # Kayıt dışı seriler beşerli parçalarla çekilir; altıncı seri ayrı parçadadır
+    codes = [f"TP.DK.T{i:02d}.S.YTL" for i in range(6)]
+    client = StubEvds(failing={codes[5]})
+    end = _today() - timedelta(days=10)
+    start = end - timedelta(days=20)
+
+    frame, failures = store.get_frame(client, codes, start, end)
+
+    assert [failure.codes for failure in failures] == [[codes[5]]]
+    assert codes[5] not in store._manifest
+    assert all(code in store._manifest for code in codes[:5])
+    assert frame[column_name(codes[5])].isna().all()
+
+    client.failing.clear()
+    client.requests.clear()
+    frame, failures = store.get_frame(client, codes, start, end)
+    assert failures == []
+    assert client.requests == [((codes[5],), start, end)]
+    assert frame[column_name(codes[5])].notna().any()
+
+
+def test_revised_last_value_overwrites_stored_value(store):
+    client = StubEvds()
+    today = _today()
+    store.get_frame(client, [USD], today - timedelta(days=30), today)
+    last = store.last_observation(USD)
+
+    client.revisions[(USD, last.strftime("%d-%m-%Y"))] = 99.5
+    store.expire([USD])
+    frame, _ = store.get_frame(client, [USD], today - timedelta(days=30), today)
+
+    assert frame.loc[last, column_name(USD)] == pytest.approx(99.5)
+    stored = store._read(USD)
+    assert stored["Tarih"].is_unique
+    assert stored.loc[stored["Tarih"] == last, column_name(USD)].item() == pytest.approx(99.5)
+
+
+def test_monthly_request_starts_at_month_start(store):
+    assert _period_start(pd.Timestamp("2024-03-15 13:00"), "M") == pd.Timestamp("2024-03-01")
+    assert _period_start(pd.Timestamp("2024-03-15 13:00"), "D") == pd.Timestamp("2024-03-15")
+
+    client = StubEvds()
+    frame, failures = store.get_frame(client, [CPI], pd.Timestamp("2024-03-15"), pd.Timestamp("2024-06-20"), freq="M")
+
+    assert failures == []
+    assert client.requests[0][1] == pd.Timestamp("2024-03-01")
+    assert list(frame.index) == list(pd.date_range("2024-03-01", "2024-06-01", freq="MS"))
+    # Ay ortasından başlayan aralık, kapsanan ayın gözlemi için yeniden istek yapmaz
+    client.requests.clear()
+    store.get_frame(client, [CPI], pd.Timestamp("2024-04-10"), pd.Timestamp("2024-06-20"), freq="M")
+    assert client.requests == []
+
+
+def test_prepend_fetches_head_only_and_defers_derived_data(store):
+    client = StubEvds()
+    today = _today()
+    store.get_frame(client, [USD], today - timedelta(days=30), today)
+    stats_first = store.stats(USD).first_date
+    client.requests.clear()
+    store.expire([USD])
+
+    failures = store.prepend(client, [USD], today - timedelta(days=400), today)
+
+    assert failures == []
+    assert client.requests == [((USD,), today - timedelta(days=400), today - timedelta(days=31))]
+    assert store.stats(USD).first_date == stats_first
+    assert store.rollup(USD, "M") is None
+
+    store.rebuild([USD])
+    stored = store._read(USD)
+    assert store.stats(USD).first_date == stored.dropna()["Tarih"].min()
+    pd.testing.assert_frame_equal(store.rollup(USD, "M"), rollup(stored, column_name(USD), "M"))
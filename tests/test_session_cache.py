@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_service
+import session_cache
+from result_cache import ResultCache
+
+CODES = ["TP.DK.USD.S.YTL"]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(data_service, "shared_cache", ResultCache())
+
+
+def _frame():
+    index = pd.DatetimeIndex(pd.date_range("2024-01-01", "2024-12-31"), name="Tarih")
+    return pd.DataFrame({"TP_DK_USD_S_YTL": np.arange(len(index), dtype="float32")}, index=index)
+
+
+def test_narrower_range_is_sliced_from_session_frame():
+    state = {}
+    session_cache.remember(state, "currency", CODES, "2024-01-01", "2024-12-31", _frame(), session_cache.current(CODES))
+
+    frame = session_cache.lookup(state, "currency", CODES, "2024-06-01", "2024-12-31")
+
+    assert frame.index[0] == pd.Timestamp("2024-06-01")
+    assert session_cache.lookup(state, "currency", CODES, "2023-06-01", "2024-12-31") is None
+
+
+def test_invalidated_series_are_reloaded():
+    state = {}
+    generation = session_cache.current(CODES)
+    session_cache.remember(state, "currency", CODES, "2024-01-01", "2024-12-31", _frame(), generation)
+
+    # Yayın sonrası yenileme (prefetch.refresh) süreç önbelleğini geçersiz kılar
+    data_service.shared_cache.invalidate(CODES)
+    assert session_cache.lookup(state, "currency", CODES, "2024-06-01", "2024-12-31") is None
+
+    # Yükleme sırasında geçersiz kılınan tablo da eskimiş sayılır
+    session_cache.remember(state, "currency", CODES, "2024-01-01", "2024-12-31", _frame(), generation)
+    assert session_cache.lookup(state, "currency", CODES, "2024-06-01", "2024-12-31") is None
+
+    session_cache.remember(state, "currency", CODES, "2024-01-01", "2024-12-31", _frame(), session_cache.current(CODES))
+    assert session_cache.lookup(state, "currency", CODES, "2024-06-01", "2024-12-31") is not None
+
+    data_service.shared_cache.invalidate(["bie_tukfiy4"])
+    assert session_cache.lookup(state, "currency", CODES, "2024-06-01", "2024-12-31") is not None